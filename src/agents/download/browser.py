@@ -0,0 +1,36 @@
+from contextlib import asynccontextmanager
+
+_context = None
+
+
+@asynccontextmanager
+async def warm_browser():
+    """
+    Keep one Chrome instance and browser context open for the duration of the block.
+
+    Downloads inside it open their pages in that context, so they share its cookies and HTTP cache.
+    """
+    global _context
+    # Imported here so that scans and tools that never open a browser do not pay for Playwright
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(channel="chrome")
+        try:
+            # Service workers would serve requests behind the back of our route blocking
+            _context = await browser.new_context(service_workers="block")
+            yield _context
+        finally:
+            _context = None
+            await browser.close()
+
+
+@asynccontextmanager
+async def browser_session():
+    """Yield the warm browser context if one is open, otherwise launch one just for this block."""
+    if _context is not None:
+        yield _context
+        return
+
+    async with warm_browser() as context:
+        yield context
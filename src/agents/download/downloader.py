@@ -1,72 +1,187 @@
 import asyncio
+import time
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Union
 
-from playwright.async_api import async_playwright
-
+from agents.download.browser import browser_session
 from agents.download.federal_register_url import get_federal_register_urls
+from agents.download.pagination import PageFetch, fetch_following_pages
+from agents.download.profile import FetchProfile, fetch_profile
+from agents.download.registry import FETCHERS, FetchBackend
+from common.content_store import spill_content
+from common.encoding import header_charset
 from common.file import writeFile
+from common.logging import get_logger
+from common.metrics import get_metrics
+from common.watermark import WatermarkStore
+from model.state import RawContent, ScanConfigItem
+
+logger = get_logger(__name__)
 
 
-async def download_agent(state):
-    # Get the scan config items for the current batch
+async def download_agent(state, watermarks: Optional[WatermarkStore] = None) -> Dict:
+    # Only the keys this node changes are returned: handing back the whole state would run the
+    # documents/watermarks/seen_links reducers over values they have already merged
     all_config_items = state["scan_config"]
     start_idx = state["current_batch"] * state["batch_size"]
     end_idx = min(start_idx + state["batch_size"], len(all_config_items))
 
     if start_idx >= len(all_config_items):
-        return state
+        return {}
+
+    if state.get("prefetched_batch") == state["current_batch"]:
+        # Resumed run: raw content for this batch was restored from a checkpoint
+        return {"prefetched_batch": None, "current_batch": state["current_batch"] + 1}
 
     batch_items = all_config_items[start_idx:end_idx]
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(channel="chrome")
-        tasks = [fetch_page(browser, item["source"], item["url"]) for item in batch_items]
-        # Process Federal Register separately to expand its URLs
-        modified_tasks = []
-        for item in batch_items:
-            if item["source"] == "FEDERAL-REGISTER":
-                # Get all URLs for Federal Register
-                fr_urls = get_federal_register_urls()
-                # Add a task for each URL with a numbered source
-                for idx, fr_url in enumerate(fr_urls, 1):
-                    modified_tasks.append(fetch_page(browser, f"FEDERAL-REGISTER-{idx}", fr_url))
-            else:
-                # For regular sources, add task as normal
-                modified_tasks.append(fetch_page(browser, item["source"], item["url"]))
-        tasks = modified_tasks
-        results = await asyncio.gather(*tasks)
-        await browser.close()
+    # Process Federal Register separately to expand its URLs
+    requests = []
+    for item in batch_items:
+        profile = fetch_profile(item)
+        if item["source"] == "FEDERAL-REGISTER":
+            # Get all URLs for Federal Register
+            fr_urls = get_federal_register_urls()
+            # Add a request for each URL with a numbered source
+            for idx, fr_url in enumerate(fr_urls, 1):
+                requests.append((f"FEDERAL-REGISTER-{idx}", fr_url, profile, item))
+        else:
+            # For regular sources, add request as normal
+            requests.append((item["source"], item["url"], profile, item))
+    results = await fetch_all(requests, watermarks)
 
     # Convert results to a dictionary with source keys
-    state["raw_content"] = {source: (url, content, content_type) for source, url, content, content_type in results}
-    store_content(state["raw_content"])
-    state["current_batch"] += 1
-    return state
+    raw_content = dict(results)
+    paths = store_content(raw_content)
+    # Large bodies are read back from the archive by the parser instead of travelling in the graph state
+    return {
+        "raw_content": {
+            source: raw._replace(content=spill_content(raw.content, paths[source]))
+            for source, raw in raw_content.items()
+        },
+        "current_batch": state["current_batch"] + 1,
+    }
+
+
+async def fetch_all(
+    requests: List[Tuple[str, str, FetchProfile, ScanConfigItem]], watermarks: Optional[WatermarkStore] = None
+) -> List[Tuple[str, RawContent]]:
+    """Fetch every request with its profile's backend; only backends the batch uses are loaded and opened."""
+    async with AsyncExitStack() as stack:
+        sessions = {}
+        for name in sorted({profile.backend for _source, _url, profile, _item in requests}):
+            backend: FetchBackend = FETCHERS.load(name)
+            sessions[name] = backend, await stack.enter_async_context(backend.session())
 
+        tasks = []
+        for source, url, profile, item in requests:
+            backend, session = sessions[profile.backend]
+            tasks.append(fetch_listing(partial(backend.fetch, session, profile=profile), source, url, item, watermarks))
+        listings = await asyncio.gather(*tasks)
+    return [page for pages in listings for page in pages]
 
-async def fetch_page(browser, source: str, url: str) -> tuple[str, str, str, str]:
-    page = await browser.new_page()
+
+async def fetch_listing(
+    fetch: PageFetch, source: str, url: str, item: ScanConfigItem, watermarks: Optional[WatermarkStore]
+) -> List[Tuple[str, RawContent]]:
+    """A source's page, followed by its further listing pages when parser_config paginates."""
+    first = await fetch(source, url)
+    return [first] + await fetch_following_pages(item, first[1], fetch, watermarks)
+
+
+def response_content_type(header: str) -> Optional[str]:
+    """Archive content type for feed and API responses, None for pages that need rendering."""
+    if any(ct in header for ct in ["application/rss+xml", "application/xml", "text/xml"]):
+        return "xml"
+    if any(ct in header for ct in ["application/json"]):
+        return "json"
+    return None
+
+
+async def fetch_page(
+    context, source: str, url: str, profile: Optional[FetchProfile] = None
+) -> tuple[str, RawContent]:
+    profile = profile or FetchProfile()
+    metrics = get_metrics()
+    page = await context.new_page()
     content_type = "htm"
+    charset = None
+    start = time.perf_counter()
+    blocked = 0
+
+    async def block_unneeded(route):
+        nonlocal blocked
+        if profile.should_block(route.request.resource_type, route.request.url):
+            blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
     try:
-        response = await page.goto(url, timeout=30000)
+        # Routing turns off the HTTP cache for this page, so only route when the profile blocks something
+        if profile.blocks_requests:
+            await page.route("**/*", block_unneeded)
+        response = await page.goto(url, timeout=profile.timeout, wait_until=profile.waitUntil)
         content_type_header = response.headers.get("content-type", "").lower()
 
-        if any(ct in content_type_header for ct in ["application/rss+xml", "application/xml", "text/xml"]):
-            content = await response.text()
-            content_type = "xml"
-        elif any(ct in content_type_header for ct in ["application/json"]):
-            content = await response.text()
-            content_type = "json"
+        # Feeds and API responses stay as the bytes the server sent; parsers decode them once
+        if response_content_type(content_type_header):
+            content = await response.body()
+            content_type = response_content_type(content_type_header)
+            charset = header_charset(content_type_header)
         else:
+            # The rendered DOM only exists as text
+            if profile.waitForSelector:
+                await wait_for_listing(page, source, profile)
+            render_start = time.perf_counter()
             content = await page.evaluate("() => document.documentElement.outerHTML")
             content_type = "htm"
+            metrics.observe("render_seconds", time.perf_counter() - render_start, source=source)
+
+        if metrics.enabled:
+            record_response_timing(source, response, content)
 
     except Exception as e:
         content = f"Error: {str(e)}"
+        metrics.error("download", type(e).__name__, source)
+    metrics.observe("fetch_duration_seconds", time.perf_counter() - start, source=source)
+    metrics.observe("fetch_blocked_requests", blocked, source=source)
     await page.close()
-    return source, url, content, content_type
+    return source, RawContent(url, content, content_type, charset)
 
 
-def store_content(content_dict: dict) -> None:
+async def wait_for_listing(page, source: str, profile: FetchProfile) -> None:
+    # Serialise whatever has rendered if the rows never show up; the parser reports an empty listing
+    try:
+        await page.wait_for_selector(profile.waitForSelector, state="attached", timeout=profile.timeout)
+    except Exception as e:
+        logger.warning("%s: %r did not appear (%s), using the page as loaded", source, profile.waitForSelector, e)
+
+
+def record_response_timing(source: str, response, content: Union[str, bytes]) -> None:
+    # Playwright reports resource timing in milliseconds relative to the request start, -1 when unavailable
+    metrics = get_metrics()
+    timing = response.request.timing
+    phases = {
+        "fetch_dns_seconds": ("domainLookupStart", "domainLookupEnd"),
+        "fetch_connect_seconds": ("connectStart", "connectEnd"),
+        "fetch_transfer_seconds": ("responseStart", "responseEnd"),
+    }
+    for metric, (start_key, end_key) in phases.items():
+        start, end = timing.get(start_key, -1), timing.get(end_key, -1)
+        if start >= 0 and end >= start:
+            metrics.observe(metric, (end - start) / 1000, source=source)
+    size = len(content) if isinstance(content, bytes) else len(content.encode("utf-8"))
+    metrics.observe("fetch_bytes", size, source=source)
+
+
+def store_content(content_dict: Dict[str, RawContent]) -> Dict[str, str]:
     # Store each URL's content in a separate file using source as key
-    for source, (url, content, content_type) in content_dict.items():
-        writeFile(source, content, content_type)
+    return {
+        source: writeFile(source, raw.content, raw.content_type, charset=raw.charset)
+        for source, raw in content_dict.items()
+    }
+
+
+BROWSER_BACKEND = FetchBackend(browser_session, fetch_page)
@@ -1,11 +1,10 @@
-import logging
 from datetime import datetime
 from typing import List, Optional
 from urllib.parse import urlencode
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
+from common.logging import get_logger
+
+logger = get_logger(__name__)
 
 BASE_URL = "https://www.federalregister.gov/api/v1/documents.json"
 AGENCIES_PER_REQUEST = 20
@@ -114,13 +113,13 @@ def get_federal_register_urls() -> List[str]:
 
     # Split agencies into chunks to avoid URL length limits
     agency_chunks = chunk_agencies(INTERESTED_AGENCIES, AGENCIES_PER_REQUEST)
-    logger.info(f"Split {len(INTERESTED_AGENCIES)} agencies into {len(agency_chunks)} chunks")
+    logger.info("Split %d agencies into %d chunks", len(INTERESTED_AGENCIES), len(agency_chunks))
 
     urls = []
     for i, agency_chunk in enumerate(agency_chunks):
-        logger.info(f"Creating URL for agency chunk {i+1} of {len(agency_chunks)}")
+        logger.info("Creating URL for agency chunk %d of %d", i + 1, len(agency_chunks))
         url = build_fed_register_url(date_str, agency_chunk, INTERESTED_TERMS)
-        logger.debug(f"Federal Register URL for chunk {i+1}: {url}")
+        logger.debug("Federal Register URL for chunk %d: %s", i + 1, url)
         urls.append(url)
 
     return urls
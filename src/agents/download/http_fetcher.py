@@ -0,0 +1,56 @@
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Tuple
+
+from agents.download.downloader import response_content_type
+from agents.download.profile import FetchProfile
+from agents.download.registry import FetchBackend
+from agents.fetch import MAX_CONNECTIONS_PER_HOST, USER_AGENT
+from common.encoding import decode_content, header_charset
+from common.metrics import get_metrics
+from model.state import RawContent
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+@asynccontextmanager
+async def http_session():
+    from aiohttp import ClientSession, TCPConnector
+
+    connector = TCPConnector(limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    async with ClientSession(connector=connector, headers={"User-Agent": USER_AGENT}) as session:
+        yield session
+
+
+async def fetch_http(
+    session: "ClientSession", source: str, url: str, profile: FetchProfile
+) -> Tuple[str, RawContent]:
+    """Plain GET without a browser, for feeds and APIs that need no rendering."""
+    from aiohttp import ClientTimeout
+
+    metrics = get_metrics()
+    content_type = "htm"
+    charset = None
+    start = time.perf_counter()
+    try:
+        async with session.get(url, timeout=ClientTimeout(total=profile.timeout / 1000)) as response:
+            response.raise_for_status()
+            header = response.headers.get("Content-Type", "").lower()
+            body = await response.read()
+        charset = header_charset(header)
+        metrics.observe("fetch_bytes", len(body), source=source)
+
+        if response_content_type(header):
+            content, content_type = body, response_content_type(header)
+        else:
+            # Archived and parsed like a rendered page, which is text
+            content = decode_content(body, charset)
+    except Exception as e:
+        content = f"Error: {str(e)}"
+        metrics.error("download", type(e).__name__, source)
+    metrics.observe("fetch_duration_seconds", time.perf_counter() - start, source=source)
+    return source, RawContent(url, content, content_type, charset)
+
+
+HTTP_BACKEND = FetchBackend(http_session, fetch_http)
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from agents.parse.registry import PARSERS
+from common.config import is_paginated, page_key
+from common.logging import get_logger
+from common.watermark import WatermarkStore
+from model.state import RawContent, ScanConfigItem
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_PAGES = 5
+# Pages requested at once from a pageUrlTemplate; a wave is only sent if the previous one still had news
+PAGE_WAVE = 3
+
+PageFetch = Callable[[str, str], Awaitable[Tuple[str, RawContent]]]  # (raw content key, url) -> (key, raw)
+
+
+async def fetch_following_pages(
+    item: ScanConfigItem, first: RawContent, fetch: PageFetch, watermarks: Optional[WatermarkStore]
+) -> List[Tuple[str, RawContent]]:
+    """
+    Fetch the pages after the first one of a paginated listing, as ``<source>-PAGE-<n>`` entries.
+
+    Stops at maxPages, at the last page, or at the first page with nothing new: every row
+    older than the source's watermark or linking to a document seen in an earlier run.
+    Without a watermark store (full scans) pages are fetched up to maxPages.
+    """
+    if not is_paginated(item):
+        return []
+
+    parser_config = item["parser_config"]
+    max_pages = int(parser_config.get("maxPages", DEFAULT_MAX_PAGES))
+    parser = PARSERS.load("HTML-PARSER")()
+    seen_links: Set[str] = set()
+    if watermarks is not None:
+        parser.watermark = watermarks.get(item["source"])
+        seen_links = watermarks.seen_links(item["source"])
+
+    def inspect(raw: RawContent) -> Tuple[bool, Optional[str]]:
+        # One soup per page answers both questions: is anything on it new, and where does "next" lead
+        if isinstance(raw.content, str) and raw.content.startswith("Error:"):
+            return False, None
+        soup = parser.make_soup(raw.content, raw.charset)
+        if not parser.has_new_items(soup, item, raw.url, seen_links):
+            return False, None
+        return True, parser.next_page_url(soup, item, raw.url) if follow_links else None
+
+    async def check(raw: RawContent) -> Tuple[bool, Optional[str]]:
+        # Parsing a whole listing page would stall every other download on the event loop
+        return await asyncio.to_thread(inspect, raw)
+
+    follow_links = not parser_config.get("pageUrlTemplate")
+    has_news, next_url = await check(first)
+    if not has_news:
+        return []
+
+    pages: List[Tuple[str, RawContent]] = []
+    if parser_config.get("pageUrlTemplate"):
+        # Page URLs are known up front, so fetch them a wave at a time
+        offset = int(parser_config.get("pageNumberOffset", 0))
+        template = parser_config["pageUrlTemplate"]
+        for wave_start in range(2, max_pages + 1, PAGE_WAVE):
+            wave = range(wave_start, min(wave_start + PAGE_WAVE, max_pages + 1))
+            results = await asyncio.gather(
+                *(fetch(page_key(item["source"], n), template.format(page=n + offset)) for n in wave)
+            )
+            checks = await asyncio.gather(*(check(raw) for _key, raw in results))
+            for (key, raw), (has_news, _next_url) in zip(results, checks, strict=True):
+                if not has_news:
+                    logger.info("%s: stopping at %s, nothing new", item["source"], key)
+                    return pages
+                pages.append((key, raw))
+    else:
+        # Each next link is only known once the page before it has loaded
+        for n in range(2, max_pages + 1):
+            if not next_url:
+                break
+            key, current = await fetch(page_key(item["source"], n), next_url)
+            has_news, next_url = await check(current)
+            if not has_news:
+                logger.info("%s: stopping at %s, nothing new", item["source"], key)
+                break
+            pages.append((key, current))
+
+    logger.info("%s: fetched %d further listing pages", item["source"], len(pages))
+    return pages
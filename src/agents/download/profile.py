@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional
+from urllib.parse import urlsplit
+
+from agents.download.registry import FETCHERS
+from model.state import ScanConfigItem
+
+# Playwright resource types we never need to serialise a listing's DOM
+DEFAULT_BLOCK_RESOURCES = frozenset({"image", "media", "font", "stylesheet"})
+# Trackers and ad networks found on regulator sites; subdomains are blocked too
+DEFAULT_BLOCK_DOMAINS = frozenset(
+    {
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "siteimproveanalytics.com",
+        "siteimprove.com",
+        "newrelic.com",
+        "nr-data.net",
+        "hotjar.com",
+        "facebook.net",
+        "twitter.com",
+        "addthis.com",
+    }
+)
+# Blocking the document (or the XHRs that fill a listing in) would leave nothing to parse
+UNBLOCKABLE_RESOURCES = frozenset({"document", "xhr", "fetch"})
+WAIT_UNTIL = ("commit", "domcontentloaded", "load", "networkidle")
+
+
+@dataclass(frozen=True)
+class FetchProfile:
+    """How one source's page is fetched; the blocking and wait settings apply to the browser backend."""
+
+    backend: str = "browser"  # see agents.download.registry.FETCHERS
+    blockResources: FrozenSet[str] = DEFAULT_BLOCK_RESOURCES
+    blockDomains: FrozenSet[str] = DEFAULT_BLOCK_DOMAINS
+    waitUntil: str = "domcontentloaded"
+    waitForSelector: Optional[str] = None
+    timeout: float = 30000  # milliseconds, for both navigation and the selector wait
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.blockResources or self.blockDomains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blockResources:
+            return True
+        host = urlsplit(url).hostname or ""
+        return any(host == domain or host.endswith(f".{domain}") for domain in self.blockDomains)
+
+
+def fetch_profile(item: ScanConfigItem) -> FetchProfile:
+    """
+    Build the fetch profile from a source's ``fetch`` config.
+
+    HTML-PARSER sources wait for their ``rowSelector`` unless ``waitForSelector`` is set; an
+    empty string turns the selector wait off.
+    """
+    config = item.get("fetch", {})
+    parser_config = item.get("parser_config", {})
+
+    backend = config.get("backend", "browser")
+    if backend not in FETCHERS:
+        raise ValueError(f"{item['source']}: fetch backend must be one of {', '.join(FETCHERS.names())}")
+
+    wait_until = config.get("waitUntil", "domcontentloaded")
+    if wait_until not in WAIT_UNTIL:
+        raise ValueError(f"{item['source']}: waitUntil must be one of {', '.join(WAIT_UNTIL)}")
+
+    selector = config.get("waitForSelector")
+    if selector is None and parser_config.get("parser") == "HTML-PARSER":
+        selector = parser_config.get("rowSelector")
+
+    return FetchProfile(
+        backend=backend,
+        blockResources=frozenset(config.get("blockResources", DEFAULT_BLOCK_RESOURCES)) - UNBLOCKABLE_RESOURCES,
+        blockDomains=frozenset(config.get("blockDomains", DEFAULT_BLOCK_DOMAINS)),
+        waitUntil=wait_until,
+        waitForSelector=selector or None,
+        timeout=float(config.get("timeout", 30000)),
+    )
+
+
+def uses_browser(scan_config: List[ScanConfigItem]) -> bool:
+    """Whether any of these sources is fetched with the browser backend, i.e. whether warming Chrome pays off."""
+    return any(fetch_profile(item).backend == "browser" for item in scan_config)
@@ -0,0 +1,21 @@
+from typing import AsyncContextManager, Awaitable, Callable, NamedTuple, Tuple
+
+from common.registry import LazyRegistry
+from model.state import RawContent
+
+
+class FetchBackend(NamedTuple):
+    """How the download stage gets a source's page: a session shared by the batch and a fetch per source."""
+
+    session: Callable[[], AsyncContextManager]
+    fetch: Callable[..., Awaitable[Tuple[str, RawContent]]]  # (session, source, url, profile) -> (source, raw)
+
+
+# Keys are the backend names used in a source's fetch.backend; "browser" is the default
+FETCHERS = LazyRegistry(
+    "fetcher",
+    {
+        "browser": "agents.download.downloader:BROWSER_BACKEND",
+        "http": "agents.download.http_fetcher:HTTP_BACKEND",
+    },
+)
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from common.content_store import is_batch, load_batch, write_batch
+from common.logging import get_logger
+from common.metrics import get_metrics
+from model.state import State
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+logger = get_logger(__name__)
+
+CONTENT_DIR = os.path.join("downloads", "content")
+CACHE_DB = os.path.join(CONTENT_DIR, "cache.db")
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 4
+CHUNK_SIZE = 64 * 1024
+MAX_INLINE_TEXT = 100_000  # longer extracted text stays on disk, referenced by textPath
+REQUEST_TIMEOUT = 120
+USER_AGENT = "horizon-scan/0.1 (regulatory change monitoring)"
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class ContentCache:
+    """Persistent URL -> downloaded file index, so links are fetched once across runs."""
+
+    def __init__(self, db_path: str = CACHE_DB):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fetched (
+                url TEXT PRIMARY KEY,
+                content_path TEXT NOT NULL,
+                text_path TEXT,
+                content_type TEXT,
+                size INTEGER,
+                fetched_at TEXT
+            )
+            """
+        )
+
+    def get(self, url: str) -> Optional[Tuple[str, Optional[str], str]]:
+        row = self.conn.execute(
+            "SELECT content_path, text_path, content_type FROM fetched WHERE url = ?", (url,)
+        ).fetchone()
+        # A cache entry is only useful while the file it points at is still there
+        if row and os.path.exists(row[0]):
+            return row
+        return None
+
+    def put(self, url: str, content_path: str, text_path: Optional[str], content_type: str, size: int) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO fetched VALUES (?, ?, ?, ?, ?, ?)",
+            (url, content_path, text_path, content_type, size, datetime.now().isoformat()),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn rather than fork: the parent has a running event loop and a logging listener thread
+        _pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def extract_text(content_path: str, content_type: str) -> Optional[str]:
+    """Extract plain text from a downloaded file and write it next to it. Runs in a worker process."""
+    if content_type == "pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            return None
+        reader = PdfReader(content_path)
+        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    else:
+        from bs4 import BeautifulSoup
+
+        with open(content_path, "rb") as f:
+            soup = BeautifulSoup(f, "html.parser")
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+        text = soup.get_text(" ", strip=True)
+
+    text_path = f"{content_path}.txt"
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return text_path
+
+
+class ContentFetcher:
+    def __init__(self, cache: ContentCache):
+        self.cache = cache
+
+    async def fetch_documents(self, documents: List[Dict]) -> List[Dict]:
+        # Deferred so runs with nothing to fetch never import aiohttp
+        from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+        connector = TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+        timeout = ClientTimeout(total=REQUEST_TIMEOUT)
+        # FR and RSS items often link the same PDF: fetch each URL once and give every document its result
+        by_url: Dict[str, Dict] = {}
+        for doc in documents:
+            by_url.setdefault(doc["linkToRegChangeText"], doc)
+        async with ClientSession(connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT}) as session:
+            updates = await asyncio.gather(*(self.fetch_document(session, doc) for doc in by_url.values()))
+        results = dict(zip(by_url, updates, strict=True))
+        return [{**doc, **results[doc["linkToRegChangeText"]]} for doc in documents]
+
+    async def fetch_document(self, session: "ClientSession", doc: Dict) -> Dict:
+        """The fields to add to documents linking to ``doc``'s URL."""
+        url = doc["linkToRegChangeText"]
+        try:
+            cached = self.cache.get(url)
+            if cached:
+                content_path, text_path, content_type = cached
+                status = "cached"
+            else:
+                content_path, content_type, size = await self._download(session, url)
+                get_metrics().observe("fetch_bytes", size, source=doc.get("source", ""))
+                text_path = await asyncio.get_running_loop().run_in_executor(
+                    _get_pool(), extract_text, content_path, content_type
+                )
+                self.cache.put(url, content_path, text_path, content_type, size)
+                status = "fetched"
+        except Exception as e:
+            logger.warning("Failed to fetch %s: %s", url, e)
+            get_metrics().error("fetch", type(e).__name__, doc.get("source", ""))
+            return {"contentStatus": f"error: {type(e).__name__}"}
+
+        update = {"contentPath": content_path, "contentStatus": status}
+        if text_path:
+            update["textPath"] = text_path
+            text = self._read_inline_text(text_path)
+            if text is not None:
+                update["pdfContent" if content_type == "pdf" else "htmlContent"] = text
+        return update
+
+    async def _download(self, session: "ClientSession", url: str) -> Tuple[str, str, int]:
+        """Stream the response body to disk so large PDFs never sit in memory."""
+        async with session.get(url) as response:
+            response.raise_for_status()
+            header = response.headers.get("Content-Type", "").lower()
+            content_type = "pdf" if "application/pdf" in header or url.lower().endswith(".pdf") else "htm"
+
+            content_path = os.path.join(CONTENT_DIR, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.{content_type}")
+            # Unique per download, so concurrent runs fetching the same URL never write into one file
+            tmp_path = f"{content_path}.{uuid.uuid4().hex}.part"
+            size = 0
+            with open(tmp_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, content_path)
+
+        return content_path, content_type, size
+
+    def _read_inline_text(self, text_path: str) -> Optional[str]:
+        if os.path.getsize(text_path) > MAX_INLINE_TEXT:
+            return None
+        with open(text_path, encoding="utf-8") as f:
+            return f.read()
+
+
+def _is_pending(doc: Dict) -> bool:
+    return bool(doc.get("linkToRegChangeText")) and "contentStatus" not in doc
+
+
+async def fetch_agent(state: State) -> Dict:
+    """Download linked detail pages and PDFs for documents that have not been fetched yet."""
+    inline = [doc for doc in state["documents"] if not is_batch(doc) and _is_pending(doc)]
+    batches = [entry for entry in state["documents"] if is_batch(entry) and not entry.get("fetched")]
+    if not inline and not batches:
+        return {"documents": []}
+
+    cache = ContentCache()
+    fetcher = ContentFetcher(cache)
+    try:
+        updated = await _fetch_pending(fetcher, inline)
+
+        # Spilled batches are loaded, enriched and written back one at a time to keep memory flat
+        for entry in batches:
+            documents = load_batch(entry)
+            enriched = iter(await _fetch_pending(fetcher, [doc for doc in documents if _is_pending(doc)]))
+            write_batch(entry, [next(enriched) if _is_pending(doc) else doc for doc in documents])
+            updated.append({**entry, "fetched": True})
+    finally:
+        cache.close()
+
+    return {"documents": updated}
+
+
+async def _fetch_pending(fetcher: ContentFetcher, pending: List[Dict]) -> List[Dict]:
+    if not pending:
+        return []
+
+    logger.info("Fetching content for %d documents", len(pending))
+    documents = await fetcher.fetch_documents(pending)
+
+    fetched = sum(1 for doc in documents if doc["contentStatus"] == "fetched")
+    cached = sum(1 for doc in documents if doc["contentStatus"] == "cached")
+    logger.info("Fetched %d new documents, %d from cache", fetched, cached)
+    return list(documents)
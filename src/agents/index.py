@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Dict, List
+
+from common.content_store import is_batch, load_batch, write_batch
+from common.logging import get_logger
+from common.search_index import SearchIndex
+from model.state import State
+
+logger = get_logger(__name__)
+
+
+async def index_agent(state: State) -> Dict:
+    """Add documents that have not been indexed yet to the local full-text search index."""
+    inline = [doc for doc in state["documents"] if not is_batch(doc) and not doc.get("indexedAt")]
+    batches = [entry for entry in state["documents"] if is_batch(entry) and not entry.get("indexed")]
+    if not inline and not batches:
+        return {"documents": []}
+
+    index = SearchIndex()
+    try:
+        updated = _index_pending(index, inline)
+
+        # Same pattern as fetch: spilled batches are indexed and written back one at a time
+        for entry in batches:
+            documents = load_batch(entry)
+            write_batch(entry, _index_pending(index, documents))
+            updated.append({**entry, "indexed": True})
+    finally:
+        index.close()
+
+    return {"documents": updated}
+
+
+def _index_pending(index: SearchIndex, documents: List[Dict]) -> List[Dict]:
+    pending = [doc for doc in documents if not doc.get("indexedAt")]
+    if not pending:
+        return list(documents)
+
+    changed = index.add_documents(pending)
+    logger.info("Indexed %d documents (%d new or updated)", len(pending), changed)
+    now = datetime.now().isoformat()
+    return [doc if doc.get("indexedAt") else {**doc, "indexedAt": now} for doc in documents]
@@ -1,20 +1,49 @@
-import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List
-
-from aiohttp import ClientSession
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
+from common.dates import normalize_date
 from model.document import Document
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+T = TypeVar("T")
+
+# Listings are newest first, so this many consecutive items older than the watermark ends the scan
+STALE_RUN_LIMIT = 3
 
 
 class BaseParser(ABC):
+    # Newest publishedOn from earlier runs of this source; ParserAgent sets it before parse()
+    watermark: Optional[datetime] = None
+    # Charset from the response's Content-Type header, for byte content; also set by ParserAgent
+    encoding: Optional[str] = None
 
-    def __init__(self, session: ClientSession):
+    def __init__(self, session: "ClientSession"):
         self.session = session
 
     @abstractmethod
-    async def parse(self, content: str, config: Dict, base_url: str) -> List[Document]:
+    async def parse(self, content: Union[str, bytes], config: Dict, base_url: str) -> List[Document]:
         pass
+
+    def fresh_items(
+        self, items: Iterable[T], get_date: Callable[[T], Optional[str]]
+    ) -> Iterator[Tuple[T, Optional[str]]]:
+        """
+        Yield ``(item, published)`` for items not older than the watermark, reading only the date.
+
+        Items whose date cannot be parsed are always kept. Stops after STALE_RUN_LIMIT old items
+        in a row, so a parser only builds Documents for what is new since the last run.
+        """
+        stale_run = 0
+        for item in items:
+            published = get_date(item)
+            parsed = normalize_date(published) if self.watermark is not None else None
+            if parsed is not None and parsed < self.watermark:
+                stale_run += 1
+                if stale_run >= STALE_RUN_LIMIT:
+                    return
+                continue
+            stale_run = 0
+            yield item, published
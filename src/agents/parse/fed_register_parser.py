@@ -1,44 +1,112 @@
+import io
 import json
-import logging
 import pprint
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Union
 
 from agents.parse.base_parser import BaseParser
+from common.dates import normalize_date, to_iso
+from common.logging import Lazy, get_logger
 from model.document import Document
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = get_logger(__name__)
+
+# Top-level keys of an API result that _map_fed_register_item_to_document reads; streaming skips the rest
+MAPPED_FIELDS = frozenset(
+    {
+        "title",
+        "abstract",
+        "publication_date",
+        "filed_at",
+        "pdf_url",
+        "effective_on",
+        "enacted_on",
+        "document_number",
+        "type",
+        "citation",
+        "agencies",
+    }
+)
+# Event-by-event decoding only pays off with one of ijson's compiled backends
+STREAMING = ijson is not None and getattr(ijson, "backend", "python") in ("yajl2_c", "yajl2_cffi")
+COMPLETE_EVENTS = frozenset({"null", "boolean", "integer", "double", "number", "string", "end_map", "end_array"})
 
 
 class FedRegisterParser(BaseParser):
     def __init__(self):
         pass
 
-    async def parse(self, content: str, config: Dict, base_url: str = None) -> List[Document]:  # noqa: ARG002
+    async def parse(
+        self, content: Union[str, bytes], config: Dict, base_url: str = None  # noqa: ARG002
+    ) -> List[Document]:
         logger.info("Starting Federal Register Parser")
         try:
-            # Parse the JSON content string
-            data = json.loads(content)
-            logger.debug(f"Federal Register JSON content parsed, found {data.get('count', 0)} documents")
-
-            # Check if we have results
-            if not data.get("results") or not isinstance(data["results"], list):
-                logger.warn("No results found in Federal Register JSON content")
+            documents = list(self.iter_documents(content, config))
+            if not documents:
+                logger.warning("No results found in Federal Register JSON content")
                 return []
 
-            # Map API results to Document objects
-            documents = [self._map_fed_register_item_to_document(item, config) for item in data["results"]]
-
-            if documents and len(documents) > 0:
-                logger.debug(f"Sample document: {pprint.pformat(documents[0].__dict__)}")
+            logger.debug("Sample document: %s", Lazy(lambda: pprint.pformat(documents[0].__dict__)))
 
-            logger.info(f"Total documents: {len(documents)}")
+            logger.info("Total documents: %d", len(documents))
             return documents
         except Exception as e:
-            logger.error(f"Error parsing Federal Register API: {str(e)}")
+            logger.error("Error parsing Federal Register API: %s", e)
             return []
 
+    def iter_documents(self, content: Union[str, bytes], config: Dict) -> Iterator[Document]:
+        """Yield a Document per API result without holding the decoded response in memory when possible."""
+        for item, _published in self.fresh_items(self._iter_results(content), self._item_date):
+            yield self._map_fed_register_item_to_document(item, config)
+
+    def _iter_results(self, content: Union[str, bytes]) -> Iterator[Dict]:
+        if STREAMING:
+            # ijson only reads text streams through a deprecated conversion, so hand it bytes
+            stream = io.BytesIO(content.encode("utf-8") if isinstance(content, str) else content)
+            yield from self._stream_results(stream)
+            return
+
+        # Fallback: decode the whole response, with orjson when it is installed (both take bytes directly)
+        data = orjson.loads(content) if orjson is not None else json.loads(content)
+        logger.debug("Federal Register JSON content parsed, found %s documents", data.get("count", 0))
+        results = data.get("results")
+        if isinstance(results, list):
+            yield from results
+
+    def _stream_results(self, stream) -> Iterator[Dict]:
+        """Walk ijson events over results[], materialising only MAPPED_FIELDS of each item."""
+        item: Optional[Dict] = None
+        field = field_prefix = None
+        builder = None
+        for prefix, event, value in ijson.parse(stream):
+            if prefix == "count" and event in ("integer", "number"):
+                # The API sends count before results, so this is logged before any item is yielded
+                logger.debug("Federal Register JSON content parsed, found %s documents", value)
+            elif prefix == "results.item":
+                if event == "start_map":
+                    item = {}
+                elif event == "map_key":
+                    field, field_prefix = value, f"results.item.{value}"
+                    builder = ijson.ObjectBuilder() if value in MAPPED_FIELDS else None
+                elif event == "end_map":
+                    yield item
+                    item = None
+            elif builder is not None:
+                builder.event(event, value)
+                # The field is complete once its own scalar or closing event arrives
+                if prefix == field_prefix and event in COMPLETE_EVENTS:
+                    item[field] = builder.value
+                    builder = None
+
     def _map_fed_register_item_to_document(self, item: Dict, config: Dict) -> Document:
         """Map a Federal Register API result to a Document object."""
         doc = Document(**config.get("defaults", {}))
@@ -46,7 +114,7 @@ class FedRegisterParser(BaseParser):
         # Basic Document fields
         doc.title = item.get("title", "No title")
         doc.summary = item.get("abstract", "")
-        doc.publishedOn = self._parse_date(item.get("publication_date") or item.get("filed_at"))
+        doc.publishedOn = self._parse_date(self._item_date(item))
         doc.linkToRegChangeText = item.get("pdf_url", "")
 
         # Additional Federal Register specific fields
@@ -69,17 +137,20 @@ class FedRegisterParser(BaseParser):
 
         return doc
 
+    @staticmethod
+    def _item_date(item: Dict) -> Optional[str]:
+        return item.get("publication_date") or item.get("filed_at")
+
     def _parse_date(self, date_str: Optional[str]) -> Optional[str]:
-        """Parse date string to standard format or return None if invalid."""
+        """Parse date string to canonical UTC ISO format or return None if invalid."""
         if not date_str:
             return None
 
-        try:
-            # Assuming date_str is in YYYY-MM-DD format
-            return date_str
-        except Exception as e:
-            logger.warning(f"Failed to parse date: {date_str}, error: {str(e)}")
+        parsed = normalize_date(date_str)
+        if parsed is None:
+            logger.warning("Failed to parse date: %s", date_str)
             return None
+        return to_iso(parsed)
 
     async def close(self):
         await super().close()
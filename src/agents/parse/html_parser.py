@@ -1,17 +1,16 @@
-import logging
 import pprint
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Union
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
 from agents.parse.base_parser import BaseParser
+from common.dates import normalize_date, normalize_iso
+from common.logging import Lazy, get_logger
 from model.document import Document
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 class HTMLParser(BaseParser):
@@ -19,25 +18,55 @@ class HTMLParser(BaseParser):
     def __init__(self):
         pass
 
-    async def parse(self, content: str, config: Dict, base_url: str) -> List[Document]:
-        soup = BeautifulSoup(content, "html.parser")
+    async def parse(self, content: Union[str, bytes], config: Dict, base_url: str) -> List[Document]:
+        soup = self.make_soup(content, self.encoding)
         parser_config = config["parser_config"]
         documents = []
 
         try:
             rows = soup.select(parser_config["rowSelector"])
-            for row in rows:
+            date_column = next((column for column in parser_config["columns"] if column["name"] == "publishedOn"), None)
+            for row, _published in self.fresh_items(rows, lambda row: self._row_date(row, date_column, base_url)):
                 doc = await self._parse_row(row, config, base_url)
                 if doc:
                     documents.append(doc)
 
-            logger.debug(f"Parsed documents: {pprint.pprint(documents[5])}")
-            logger.info(f"Parsed {len(documents)} HTML table rows")
+            if documents:
+                logger.debug("Sample document: %s", Lazy(lambda: pprint.pformat(documents[0])))
+            logger.info("Parsed %d HTML table rows", len(documents))
             return documents
         except Exception as e:
-            logger.error(f"Error parsing HTML table: {str(e)}")
+            logger.error("Error parsing HTML table: %s", e)
             return []
 
+    @staticmethod
+    def make_soup(content: Union[str, bytes], charset: Optional[str] = None) -> BeautifulSoup:
+        # Rendered pages arrive as text; BeautifulSoup decodes bytes itself, given the header charset when known
+        return BeautifulSoup(content, "html.parser", from_encoding=charset if isinstance(content, bytes) else None)
+
+    def has_new_items(self, soup: BeautifulSoup, config: Dict, base_url: str, seen_links: Set[str]) -> bool:
+        """
+        True if the listing page has a row that is neither older than the watermark nor linked before.
+
+        Rows with neither a parseable date nor a link, such as header rows, say nothing about the page and are skipped.
+        """
+        columns = {column["name"]: column for column in config["parser_config"]["columns"]}
+        date_column, link_column = columns.get("publishedOn"), columns.get("linkToRegChangeText")
+
+        rows = soup.select(config["parser_config"]["rowSelector"])
+        for row, published in self.fresh_items(rows, lambda row: self._row_date(row, date_column, base_url)):
+            link = self._extract_column_value(row, link_column, base_url) if link_column else ""
+            if not link and normalize_date(published) is None:
+                continue
+            if not link or link not in seen_links:
+                return True
+        return False
+
+    def next_page_url(self, soup: BeautifulSoup, config: Dict, base_url: str) -> Optional[str]:
+        """Target of the listing's "next page" link (parser_config.nextPageSelector), if there is one."""
+        element = soup.select_one(config["parser_config"]["nextPageSelector"])
+        return (self._extract_link(element, base_url) or None) if element else None
+
     async def _parse_row(self, row: Tag, scan_config: Dict, base_url: str) -> Optional[Document]:
         try:
             config = scan_config["parser_config"]
@@ -49,9 +78,12 @@ class HTMLParser(BaseParser):
 
             return doc
         except Exception as e:
-            logger.error(f"Error parsing row: {str(e)}")
+            logger.error("Error parsing row: %s", e)
             return None
 
+    def _row_date(self, row: Tag, column: Optional[Dict], base_url: str) -> Optional[str]:
+        return self._extract_column_value(row, column, base_url) if column else None
+
     def _extract_column_value(self, row: Tag, column: Dict, base_url: str) -> str:
         element = row.select_one(column["selector"])
         if not element:
@@ -59,6 +91,8 @@ class HTMLParser(BaseParser):
 
         if column.get("name") == "linkToRegChangeText":
             return self._extract_link(element, base_url)
+        elif column.get("name") == "publishedOn":
+            return normalize_iso(element.get_text(strip=True))
         else:
             return element.get_text(strip=True)
 
@@ -1,56 +1,116 @@
 import asyncio
-import logging
-from typing import Dict, Type
-
-from aiohttp import ClientSession
+import time
+from typing import Dict, List, Optional, Union
 
 from agents.parse.base_parser import BaseParser
-from agents.parse.fed_register_parser import FedRegisterParser
-from agents.parse.html_parser import HTMLParser
-from agents.parse.rss_parser import RSSParserCustom
-from agents.parse.simple_rss_parser import RssParser
-from model.state import State
+from agents.parse.registry import PARSERS
+from common.config import find_source_config, is_paginated
+from common.content_store import ContentHandle, documents_size, is_batch, load_content, spill_documents
+from common.dates import normalize_date, to_iso
+from common.logging import get_logger
+from common.metrics import get_metrics
+from common.watermark import WatermarkStore
+from model.document import Document
+from model.state import ScanConfigItem, State, merge_seen_links, merge_watermarks
 
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 class ParserAgent:
-    def __init__(self):
-        self.parsers: Dict[str, Type[BaseParser]] = {
-            "RSS-PARSER-CUSTOM": RSSParserCustom,
-            "HTML-PARSER": HTMLParser,
-            "RSS-PARSER": RssParser,
-            "FED-REGISTER-PARSER": FedRegisterParser,
-        }
+    def __init__(self, watermarks: Optional[WatermarkStore] = None):
+        # Without a store (e.g. replay) every item is parsed and no watermarks are reported
+        self.watermarks = watermarks
+        # Parser modules (and lxml, feedparser, bs4 behind them) are imported the first time a source uses them
+        self.parsers = PARSERS
 
     async def parse_content(self, state: State) -> Dict:
         documents = []
+        watermarks: Dict[str, str] = {}
+        seen_links: Dict[str, List[str]] = {}
+
+        sources = list(state["raw_content"])
+        tasks = [
+            self.parse_source(source, raw.url, raw.content, state["scan_config"], raw.charset)
+            for source, raw in state["raw_content"].items()
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for source, result in zip(sources, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error("Error during parsing: %s", result)
+            elif isinstance(result, list):
+                documents.extend(result)
+                self._collect_progress(source, result, state["scan_config"], watermarks, seen_links)
+
+        # Earlier batches' documents count against the spill threshold too, so a long run does not grow the state
+        inline_size = documents_size(doc for doc in state["documents"] if not is_batch(doc))
+        # Watermarks and seen links ride along in the state and are persisted only once the run has finished
+        return {
+            "documents": spill_documents([doc.to_dict() for doc in documents], inline_size),
+            "watermarks": watermarks,
+            "seen_links": seen_links,
+        }
+
+    def _collect_progress(
+        self,
+        source: str,
+        documents: List[Document],
+        scan_config: List[ScanConfigItem],
+        watermarks: Dict[str, str],
+        seen_links: Dict[str, List[str]],
+    ) -> None:
+        if self.watermarks is None:
+            return
+        # Split sources (FEDERAL-REGISTER-n, X-PAGE-n) share their config source's watermark and links
+        source_config = find_source_config(source, scan_config)
+        config_source = source_config["source"]
+        published = [parsed for doc in documents if (parsed := normalize_date(doc.publishedOn))]
+        if published:
+            watermarks.update(merge_watermarks(watermarks, {config_source: to_iso(max(published))}))
+        if is_paginated(source_config):
+            # Paginated listings stop at pages whose links were all seen before (agents.download.pagination)
+            links = [doc.linkToRegChangeText for doc in documents if doc.linkToRegChangeText]
+            seen_links.update(merge_seen_links(seen_links, {config_source: links}))
+
+    async def parse_source(
+        self,
+        source: str,
+        url: Optional[str],
+        content: Union[str, bytes, ContentHandle],
+        scan_config: List[ScanConfigItem],
+        charset: Optional[str] = None,
+    ) -> List[Document]:
+        """Parse one source's raw content with the parser its config names. Spilled content is read only here."""
+        source_config = find_source_config(source, scan_config)
+        if source_config is None:
+            raise ValueError(f"No scan config for source {source}")
+
+        parser_type = source_config["parser_config"]["parser"]
+        parser = self.parsers.load(parser_type)()
+        parser.encoding = charset
+        if self.watermarks is not None:
+            parser.watermark = self.watermarks.get(source_config["source"])
+
+        logger.info("Parsing content for %s using %s", source, parser_type)
+        base_url = url or source_config["url"]
+        documents = await self._timed_parse(parser, source, load_content(content), source_config, base_url)
+        for doc in documents:
+            doc.scanSource = source_config["source"]
+        return documents
+
+    async def _timed_parse(
+        self, parser: BaseParser, source: str, content: Union[str, bytes], config: Dict, url: str
+    ) -> List[Document]:
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return await parser.parse(content, config, url)
 
-        async with ClientSession():
-            tasks = []
-            for source, (url, content, _content_type) in state["raw_content"].items():
-                # Find the matching source config
-                source_config = None
-                for item in state["scan_config"]:
-                    if item.get("source") == source or (
-                        source.startswith("FEDERAL-REGISTER-") and item.get("source") == "FEDERAL-REGISTER"
-                    ):
-                        source_config = item
-                        break
-
-                parser_type = source_config["parser_config"]["parser"]
-                parser = self.parsers[parser_type]()
-
-                logger.info(f"Parsing content for {source} using {parser_type}")
-                tasks.append(parser.parse(content, source_config, url))
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Error during parsing: {result}")
-                elif isinstance(result, list):
-                    documents.extend(result)
-
-        return {"documents": [doc.to_dict() for doc in documents]}
+        start = time.perf_counter()
+        try:
+            documents = await parser.parse(content, config, url)
+        except Exception as e:
+            metrics.error("parse", type(e).__name__, source)
+            raise
+        metrics.observe("parse_seconds", time.perf_counter() - start, source=source)
+        metrics.observe("parse_documents", len(documents), source=source)
+        return documents
@@ -0,0 +1,12 @@
+from common.registry import LazyRegistry
+
+# Keys are the parser names used in parser_config.parser
+PARSERS = LazyRegistry(
+    "parser",
+    {
+        "RSS-PARSER-CUSTOM": "agents.parse.rss_parser:RSSParserCustom",
+        "HTML-PARSER": "agents.parse.html_parser:HTMLParser",
+        "RSS-PARSER": "agents.parse.simple_rss_parser:RssParser",
+        "FED-REGISTER-PARSER": "agents.parse.fed_register_parser:FedRegisterParser",
+    },
+)
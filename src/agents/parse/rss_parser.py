@@ -1,14 +1,16 @@
 import pprint
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from bs4 import BeautifulSoup
 from lxml import etree
 
 from agents.parse.base_parser import BaseParser
-from common.logging_config import get_logger
+from common.dates import normalize_iso
+from common.encoding import detect_encoding
+from common.logging import Lazy, get_logger
 from model.document import Document
 
-logger = get_logger(__name__, "DEBUG")
+logger = get_logger(__name__)
 
 
 class RSSParserCustom(BaseParser):
@@ -37,21 +39,40 @@ class RSSParserCustom(BaseParser):
             "category": ["category", "dc:subject"],  # Added XPaths for categories
         }
 
-    async def parse(self, content: str, config: Dict, base_url: str) -> List[Document]:
+    async def parse(self, content: Union[str, bytes], config: Dict, base_url: str) -> List[Document]:
         """Parse RSS content into Document objects."""
         try:
-            root = etree.fromstring(content.encode("utf-8"))
+            root = self._parse_xml(content)
             items = self._extract_items(root)
-            logger.debug(f"Extracted {len(items)} items from feed")
+            logger.debug("Extracted %d items from feed", len(items))
 
-            documents = [self._create_document(item, config) for item in items]
-            logger.debug(f"Parsed documents: {pprint.pprint(documents[5])}")
+            documents = [
+                self._create_document(item, config, published)
+                for item, published in self.fresh_items(items, self._get_date)
+            ]
+            if documents:
+                logger.debug("Sample document: %s", Lazy(lambda: pprint.pformat(documents[0])))
 
             return documents
         except Exception as e:
-            logger.error(f"Parsing error: {e}")
+            logger.error("Parsing error: %s", e)
             return []
 
+    def _parse_xml(self, content: Union[str, bytes]) -> etree._Element:
+        if isinstance(content, str):
+            # Rendered or legacy text content; lxml rejects str input that carries an encoding declaration
+            return etree.fromstring(content.encode("utf-8"), parser=etree.XMLParser(encoding="utf-8"))
+        # Bytes go to libxml2 as-is; only a header charset (which outranks the XML declaration) needs passing on
+        encoding = detect_encoding(content, self.encoding) if self.encoding else None
+        try:
+            return etree.fromstring(content, parser=etree.XMLParser(encoding=encoding))
+        except etree.XMLSyntaxError as e:
+            if encoding is None:
+                raise
+            # Servers misreport charsets; the body's own declaration or BOM may still be right
+            logger.warning("Feed does not parse as header charset %s (%s), retrying without it", encoding, e)
+            return etree.fromstring(content, parser=etree.XMLParser())
+
     def _extract_items(self, root: etree._Element) -> List[etree._Element]:
         """Extract items with basic format detection."""
         for fmt in self.FEED_FORMATS:
@@ -63,13 +84,13 @@ class RSSParserCustom(BaseParser):
 
         return []
 
-    def _create_document(self, item: etree._Element, config: Dict) -> Document:
+    def _create_document(self, item: etree._Element, config: Dict, published: Optional[str]) -> Document:
         """Create document with essential fields only."""
         return Document(
             **config.get("defaults", {}),
             title=self._get_title(item, "title"),
             summary=self._get_description(item),
-            publishedOn=self._get_date(item),
+            publishedOn=normalize_iso(published),
             linkToRegChangeText=self._get_link(item),
             category=self._get_category(item),
         )
@@ -158,20 +179,20 @@ class RSSParserCustom(BaseParser):
             rss_cats = item.xpath(".//category/text()", namespaces=self.NAMESPACES)
             categories.update(cat.strip() for cat in rss_cats if cat and cat.strip())
         except Exception as e:
-            logger.debug(f"Failed to extract RSS categories: {e}")
+            logger.debug("Failed to extract RSS categories: %s", e)
 
         # Atom: <category term="Technology"/>
         try:
             atom_cats = item.xpath(".//atom:category/@term", namespaces=self.NAMESPACES)
             categories.update(cat.strip() for cat in atom_cats if cat and cat.strip())
         except Exception as e:
-            logger.debug(f"Failed to extract Atom categories: {e}")
+            logger.debug("Failed to extract Atom categories: %s", e)
 
         # Dublin Core: <dc:subject>Finance</dc:subject>
         try:
             dc_cats = item.xpath(".//dc:subject/text()", namespaces=self.NAMESPACES)
             categories.update(cat.strip() for cat in dc_cats if cat and cat.strip())
         except Exception as e:
-            logger.debug(f"Failed to extract Dublin Core subjects: {e}")
+            logger.debug("Failed to extract Dublin Core subjects: %s", e)
 
         return ", ".join(sorted(categories)) if categories else ""
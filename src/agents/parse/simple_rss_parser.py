@@ -1,29 +1,33 @@
 import pprint
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
 
 import feedparser
 from bs4 import BeautifulSoup
 
 from agents.parse.base_parser import BaseParser
-from common.logging_config import get_logger
+from common.dates import normalize_iso, to_iso
+from common.logging import Lazy, get_logger
 from model.document import Document
 
-logger = get_logger(__name__, "DEBUG")
+logger = get_logger(__name__)
 
 
 class RssParser(BaseParser):
     def __init__(self):
         pass
 
-    async def parse(self, content: str, config: Dict, base_url: str) -> List[Document]:
+    async def parse(self, content: Union[str, bytes], config: Dict, base_url: str) -> List[Document]:
         try:
-            feed = feedparser.parse(content)
+            # feedparser sniffs the encoding of byte content itself; a header charset is passed on as the server sent it
+            headers = {"content-type": f"application/xml; charset={self.encoding}"} if self.encoding else None
+            feed = feedparser.parse(content, response_headers=headers)
             documents = []
 
-            for entry in feed.entries:
+            for entry, published in self.fresh_items(feed.entries, self._entry_date):
                 # Extract data from entry
                 data = self._extract_entry_data(entry, feed, base_url)
+                data["publishedOn"] = normalize_iso(published) or ""
 
                 # Create document with extracted data and config defaults
                 document = Document(
@@ -36,11 +40,12 @@ class RssParser(BaseParser):
                 )
                 documents.append(document)
 
-            logger.debug(f"Parsed documents: {pprint.pprint(documents[5])}")
-            logger.debug(f"Parsed {len(documents)} documents from feed at {base_url}")
+            if documents:
+                logger.debug("Sample document: %s", Lazy(lambda: pprint.pformat(documents[0])))
+            logger.debug("Parsed %d documents from feed at %s", len(documents), base_url)
             return documents
         except Exception as e:
-            logger.error(f"Error parsing feed content: {str(e)}")
+            logger.error("Error parsing feed content: %s", e)
             return []
 
     def _extract_entry_data(self, entry: Any, feed: Any, base_url: str) -> Dict[str, Any]:
@@ -60,14 +65,16 @@ class RssParser(BaseParser):
         # Clean HTML tags from summary
         data["summary"] = self._clean_html(data["summary"])
 
-        # Convert published date if available
-        if "published_parsed" in entry and entry.published_parsed:
+        return data
+
+    def _entry_date(self, entry: Any) -> Optional[str]:
+        # feedparser's published_parsed is already UTC; fall back to the raw string it could not parse
+        if entry.get("published_parsed"):
             try:
-                data["publishedOn"] = datetime(*entry.published_parsed[:6]).isoformat()
+                return to_iso(datetime(*entry.published_parsed[:6], tzinfo=timezone.utc))
             except (TypeError, ValueError) as e:
-                logger.debug(f"Failed to parse date: {e}")
-
-        return data
+                logger.debug("Failed to parse date: %s", e)
+        return entry.get("published") or entry.get("updated")
 
     def _clean_html(self, text: str) -> str:
         if not text:
@@ -0,0 +1,23 @@
+import json
+import os
+from typing import Dict, List
+
+from common.file import getFileName
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+OUTPUT_DIR = os.path.join("output", "documents")
+
+
+def persist_documents(source: str, documents: List[Dict], output_dir: str = OUTPUT_DIR) -> str:
+    """Write one source's parsed documents to a timestamped JSON file and return its path."""
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, f"{getFileName(f'{source}_')}.json")
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(documents, f, ensure_ascii=False, indent=2)
+    # Rename last so a crashed consumer never leaves a truncated result behind
+    os.replace(tmp_path, file_path)
+    logger.info("Wrote %d documents for %s to %s", len(documents), source, file_path)
+    return file_path
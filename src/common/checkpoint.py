@@ -0,0 +1,172 @@
+import base64
+import json
+import os
+import sqlite3
+from datetime import datetime
+from functools import wraps
+from typing import Dict, Optional
+
+from common.content_store import ContentHandle
+from common.logging import get_logger
+from model.state import RawContent, add_documents, merge_seen_links, merge_watermarks
+
+logger = get_logger(__name__)
+
+CHECKPOINT_DB = os.path.join("downloads", "checkpoints.db")
+# State keys LangGraph merges with a reducer rather than overwriting (see model.state.State)
+REDUCED_KEYS = ("documents", "watermarks", "seen_links")
+
+
+class CheckpointStore:
+    """
+    Keeps the latest graph state of each run in SQLite so an interrupted run can be resumed.
+
+    Documents are stored apart from the rest of the state, one chunk per batch. A batch's chunk is
+    rewritten after each of its nodes and left alone once the batch is complete, so a save costs the
+    current batch rather than everything the run has collected.
+    """
+
+    def __init__(self, run_id: str, db_path: str = CHECKPOINT_DB):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.run_id = run_id
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                node TEXT,
+                batch_complete INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'running',
+                state TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_documents (
+                run_id TEXT NOT NULL,
+                chunk INTEGER NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL,
+                documents TEXT NOT NULL,
+                PRIMARY KEY (run_id, chunk)
+            )
+            """
+        )
+        # Chunks of completed batches hold the first _stored_documents documents of the state
+        self._chunk, self._stored_documents = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM run_documents WHERE run_id = ? AND complete = 1",
+            (run_id,),
+        ).fetchone()
+
+    def save(self, node: str, state: Dict, batch_complete: bool) -> None:
+        snapshot = {
+            "scan_config": state["scan_config"],
+            "batch_size": state["batch_size"],
+            "current_batch": state["current_batch"],
+            # Once the batch has gone through every stage its raw content is no longer needed
+            "raw_content": {} if batch_complete else state["raw_content"],
+            "watermarks": state.get("watermarks") or {},
+            "seen_links": state.get("seen_links") or {},
+        }
+        # Documents of earlier batches are already stored; only the current batch's are written
+        batch_documents = list(state["documents"])[self._stored_documents :]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO run_documents (run_id, chunk, complete, size, documents) VALUES (?, ?, ?, ?, ?)",
+            (self.run_id, self._chunk, int(batch_complete), len(batch_documents), json.dumps(batch_documents)),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs (run_id, node, batch_complete, status, state, updated_at) "
+            "VALUES (?, ?, ?, 'running', ?, ?)",
+            (self.run_id, node, int(batch_complete), json.dumps(snapshot, default=_encode), datetime.now().isoformat()),
+        )
+        self.conn.commit()
+        if batch_complete:
+            self._chunk += 1
+            self._stored_documents += len(batch_documents)
+
+    def complete(self) -> None:
+        # A finished run is never resumed, so only its status is kept
+        self.conn.execute(
+            "UPDATE runs SET status = 'complete', state = '{}', updated_at = ? WHERE run_id = ?",
+            (datetime.now().isoformat(), self.run_id),
+        )
+        self.conn.execute("DELETE FROM run_documents WHERE run_id = ?", (self.run_id,))
+        self.conn.commit()
+
+    def resume_state(self) -> Optional[Dict]:
+        """Initial state that continues this run where it stopped, or None if there is nothing to resume."""
+        row = self.conn.execute(
+            "SELECT node, batch_complete, status, state FROM runs WHERE run_id = ?", (self.run_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"No checkpoint for run {self.run_id}")
+        node, batch_complete, status, state_json = row
+        if status == "complete":
+            return None
+
+        state = json.loads(state_json)
+        chunks = self.conn.execute(
+            "SELECT documents FROM run_documents WHERE run_id = ? ORDER BY chunk", (self.run_id,)
+        ).fetchall()
+        # Checkpoints written before documents were chunked still carry them inline
+        state["documents"] = [doc for (chunk,) in chunks for doc in json.loads(chunk)] or state.get("documents", [])
+        state["raw_content"] = {
+            source: RawContent(url, _decode(content), *rest)
+            for source, (url, content, *rest) in state["raw_content"].items()
+        }
+        if not batch_complete:
+            # Download finished but later stages did not: re-run them on the content we already have
+            state["current_batch"] -= 1
+            state["prefetched_batch"] = state["current_batch"]
+        logger.info("Resuming run %s after %s at batch %d", self.run_id, node, state["current_batch"])
+        return state
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _encode(value):
+    if isinstance(value, ContentHandle):
+        return value.to_dict()
+    if isinstance(value, bytes):
+        # Only bodies under the spill threshold are held in memory, so inlining them is cheap enough
+        return {"contentBytes": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot checkpoint {type(value).__name__}")
+
+
+def _decode(content):
+    # Spilled content is checkpointed as a handle; the file it points at is the download archive
+    if isinstance(content, dict) and "contentBytes" in content:
+        return base64.b64decode(content["contentBytes"])
+    return ContentHandle.from_dict(content) if isinstance(content, dict) else content
+
+
+_store: Optional[CheckpointStore] = None
+
+
+def configure_checkpoints(run_id: Optional[str]) -> Optional[CheckpointStore]:
+    """Checkpoint every node of this process's pipeline runs under ``run_id``. Call before building the pipeline."""
+    global _store
+    _store = CheckpointStore(run_id) if run_id else None
+    return _store
+
+
+def checkpoint_node(name: str, node, completes_batch: bool = False):
+    """Save the merged state after the node returns. Returns the node unchanged when checkpointing is off."""
+    if _store is None:
+        return node
+    store = _store
+
+    @wraps(node)
+    async def checkpointed_node(state):
+        update = await node(state)
+        merged = {**state, **{key: value for key, value in update.items() if key not in REDUCED_KEYS}}
+        merged["documents"] = add_documents(state["documents"], update.get("documents", []))
+        merged["watermarks"] = merge_watermarks(state.get("watermarks"), update.get("watermarks"))
+        merged["seen_links"] = merge_seen_links(state.get("seen_links"), update.get("seen_links"))
+        store.save(name, merged, completes_batch)
+        return update
+
+    return checkpointed_node
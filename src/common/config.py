@@ -1,9 +1,15 @@
 import json
-import logging
-from typing import List
+import re
+from typing import List, Optional
 
+from common.logging import get_logger
 from model.state import ScanConfigItem
 
+logger = get_logger(__name__)
+
+# Raw content keys for the second and later pages of a paginated listing: <source>-PAGE-<n>
+PAGE_KEY = re.compile(r"^(?P<source>.+)-PAGE-\d+$")
+
 
 def load_producer_config(config_file: str) -> List[ScanConfigItem]:
     try:
@@ -17,11 +23,34 @@ def load_producer_config(config_file: str) -> List[ScanConfigItem]:
                 "url": item["url"],
                 "parser_config": item.get("parser_config", {}),
                 "defaults": item.get("defaults", {}),
+                "schedule": item.get("schedule", {}),
+                "fetch": item.get("fetch", {}),
             }
             for item in config_data
             if "source" in item and "url" in item
         ]
 
     except Exception as e:
-        logging.error(f"Error loading configuration: {str(e)}")
+        logger.error("Error loading configuration: %s", e)
         raise
+
+
+def is_paginated(item: ScanConfigItem) -> bool:
+    parser_config = item.get("parser_config", {})
+    return bool(parser_config.get("pageUrlTemplate") or parser_config.get("nextPageSelector"))
+
+
+def page_key(source: str, page: int) -> str:
+    return f"{source}-PAGE-{page}"
+
+
+def find_source_config(source: str, scan_config: List[ScanConfigItem]) -> Optional[ScanConfigItem]:
+    """Find the config item for a raw content key, including expanded keys such as FEDERAL-REGISTER-3 or X-PAGE-2."""
+    if match := PAGE_KEY.match(source):
+        source = match["source"]
+    for item in scan_config:
+        if item.get("source") == source or (
+            source.startswith("FEDERAL-REGISTER-") and item.get("source") == "FEDERAL-REGISTER"
+        ):
+            return item
+    return None
@@ -0,0 +1,103 @@
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Iterator, List, Union
+
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Payloads above this many characters (bytes for XML and JSON) leave the graph state and are read back
+# from disk on demand
+SPILL_THRESHOLD = int(os.environ.get("SCAN_SPILL_THRESHOLD", 1024 * 1024))
+BATCH_DIR = os.path.join("downloads", "batches")
+BATCH_KEY = "documentBatch"
+
+
+@dataclass(frozen=True)
+class ContentHandle:
+    """Reference to raw content kept on disk instead of in the graph state."""
+
+    path: str
+    size: int
+    binary: bool = False  # XML and JSON bodies are archived as the bytes the server sent
+
+    def read(self) -> Union[str, bytes]:
+        if self.binary:
+            with open(self.path, "rb") as f:
+                return f.read()
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def to_dict(self) -> Dict:
+        return {"contentHandle": asdict(self)}
+
+    @staticmethod
+    def from_dict(value: Dict) -> "ContentHandle":
+        return ContentHandle(**value["contentHandle"])
+
+
+def spill_content(content: Union[str, bytes], path: str) -> Union[str, bytes, ContentHandle]:
+    """Swap content already written to ``path`` for a handle once it passes the spill threshold."""
+    if len(content) <= SPILL_THRESHOLD:
+        return content
+    return ContentHandle(path=path, size=len(content), binary=isinstance(content, bytes))
+
+
+def load_content(content: Union[str, bytes, ContentHandle]) -> Union[str, bytes]:
+    return content.read() if isinstance(content, ContentHandle) else content
+
+
+def is_batch(entry: Dict) -> bool:
+    return BATCH_KEY in entry
+
+
+def documents_size(entries: Iterable[Dict]) -> int:
+    """Approximate size of documents as counted against the spill threshold."""
+    return sum(len(str(value)) for entry in entries for value in entry.values())
+
+
+def spill_documents(documents: List[Dict], inline_size: int = 0, batch_dir: str = BATCH_DIR) -> List[Dict]:
+    """
+    Replace a list of documents with a single batch entry pointing at a JSON Lines file.
+
+    Documents stay inline only while they and the ``inline_size`` already in the state fit under the
+    spill threshold, so the state stays bounded however many batches a run has. Batch entries live in
+    ``state["documents"]`` next to ordinary documents; use ``iter_documents`` to read through both.
+    """
+    if not documents or inline_size + documents_size(documents) <= SPILL_THRESHOLD:
+        return documents
+
+    os.makedirs(batch_dir, exist_ok=True)
+    entry = {BATCH_KEY: os.path.join(batch_dir, f"{uuid.uuid4().hex}.jsonl"), "count": len(documents)}
+    write_batch(entry, documents)
+    logger.debug("Spilled %d documents to %s", len(documents), entry[BATCH_KEY])
+    return [entry]
+
+
+def load_batch(entry: Dict) -> List[Dict]:
+    with open(entry[BATCH_KEY], "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def write_batch(entry: Dict, documents: List[Dict]) -> None:
+    tmp_path = f"{entry[BATCH_KEY]}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for doc in documents:
+            f.write(json.dumps(doc, ensure_ascii=False))
+            f.write("\n")
+    os.replace(tmp_path, entry[BATCH_KEY])
+
+
+def iter_documents(entries: List[Dict]) -> Iterator[Dict]:
+    """Yield every document, loading spilled batches one at a time."""
+    for entry in entries:
+        if is_batch(entry):
+            yield from load_batch(entry)
+        else:
+            yield entry
+
+
+def count_documents(entries: List[Dict]) -> int:
+    return sum(entry["count"] if is_batch(entry) else 1 for entry in entries)
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+
+# Formats seen on regulator HTML listing pages, tried after ISO 8601 and RFC 822
+LISTING_FORMATS = [
+    "%B %d, %Y",  # March 5, 2024
+    "%b %d, %Y",  # Mar 5, 2024
+    "%b. %d, %Y",  # Mar. 5, 2024
+    "%d %B %Y",  # 5 March 2024
+    "%d %b %Y",  # 5 Mar 2024
+    "%m/%d/%Y",  # 03/05/2024
+    "%Y-%m-%d %H:%M:%S",
+]
+
+
+@lru_cache(maxsize=8192)
+def normalize_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a date string from any of our sources into an aware UTC datetime.
+
+    Feeds repeat the same few date strings many times, so results are cached. Values without
+    a timezone are taken to be UTC. Returns None when the value cannot be parsed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    parsed = None
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            for fmt in LISTING_FORMATS:
+                try:
+                    parsed = datetime.strptime(value, fmt)
+                    break
+                except ValueError:
+                    continue
+
+    if parsed is None:
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+def to_iso(value: datetime) -> str:
+    """Canonical string form used for publishedOn and watermarks; sorts chronologically as text."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def normalize_iso(value: Optional[str]) -> Optional[str]:
+    """Canonical form of a date string, or the original string when it cannot be parsed."""
+    parsed = normalize_date(value)
+    return to_iso(parsed) if parsed else value
@@ -0,0 +1,65 @@
+import codecs
+import re
+from typing import Optional, Union
+
+# Longest first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+XML_DECLARATION = re.compile(rb"""^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._:-]+)["']""")
+HTML_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+CONTENT_TYPE_CHARSET = re.compile(r"""charset\s*=\s*["']?([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+# Declarations are only looked for near the start of the body
+SNIFF_BYTES = 1024
+
+
+def header_charset(content_type: Optional[str]) -> Optional[str]:
+    """The charset parameter of a Content-Type header, if it names a known codec."""
+    match = CONTENT_TYPE_CHARSET.search(content_type or "")
+    return _known(match.group(1)) if match else None
+
+
+def detect_encoding(content: bytes, declared: Optional[str] = None) -> str:
+    """
+    Pick the encoding of a raw body: byte order mark, then the charset from the response
+    headers, then the XML declaration or HTML meta tag, falling back to UTF-8.
+    """
+    for bom, encoding in BOMS:
+        if content.startswith(bom):
+            return encoding
+
+    if _known(declared):
+        return _known(declared)
+
+    head = bytes(content[:SNIFF_BYTES])
+    for pattern in (XML_DECLARATION, HTML_META_CHARSET):
+        match = pattern.search(head)
+        if match and _known(match.group(1).decode("ascii")):
+            return _known(match.group(1).decode("ascii"))
+    return "utf-8"
+
+
+def decode_content(content: Union[str, bytes], declared: Optional[str] = None) -> str:
+    """Text of a raw body, for the few consumers that cannot take bytes."""
+    if isinstance(content, str):
+        return content
+    encoding = detect_encoding(content, declared)
+    # utf-8-sig drops a UTF-8 BOM; the utf-16/32 codecs drop theirs already
+    if codecs.lookup(encoding).name == "utf-8":
+        encoding = "utf-8-sig"
+    return bytes(content).decode(encoding, errors="replace")
+
+
+def _known(encoding: Optional[str]) -> Optional[str]:
+    # Keep the declared spelling: lxml and feedparser hand it to libxml2/iconv, not to Python's codecs
+    if not encoding:
+        return None
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return None
+    return encoding
@@ -1,7 +1,25 @@
 import os
+import re
 import datetime
 import shutil
-from typing import Optional, Union, TextIO, BinaryIO, Any
+from typing import List, NamedTuple, Optional, Union, TextIO, BinaryIO, Any
+
+# Names written by writeFile: <source>_<YYYYmmdd-HHMM>.data.<content_type>
+ARCHIVE_NAME = re.compile(r"^(?P<source>.+)_(?P<timestamp>\d{8}-\d{4})\.data\.(?P<content_type>\w+)$")
+
+
+# Content types archived as the raw response bytes rather than UTF-8 text
+BINARY_CONTENT_TYPES = frozenset({"xml", "json"})
+# Suffix of the file next to a raw archive that keeps the charset of the response's Content-Type header
+CHARSET_SUFFIX = ".charset"
+
+
+class ArchivedFile(NamedTuple):
+    path: str
+    source: str
+    timestamp: datetime.datetime
+    content_type: str
+    charset: Optional[str] = None
 
 
 def getFileName(key: str) -> str:
@@ -9,7 +27,14 @@ def getFileName(key: str) -> str:
     return f"{key}{timestamp}.data"
 
 
-def writeFile(source: str, content: str, content_type: str = "htm", mode: str = "w", encoding: str = "utf-8") -> None:
+def writeFile(
+    source: str,
+    content: Union[str, bytes],
+    content_type: str = "htm",
+    mode: str = "w",
+    encoding: str = "utf-8",
+    charset: Optional[str] = None,
+) -> str:
     base_dir = os.path.join("downloads")
     filename = getFileName(f"{source}_")
     file_path = os.path.join(base_dir, f"{filename}.{content_type}")
@@ -18,8 +43,16 @@ def writeFile(source: str, content: str, content_type: str = "htm", mode: str =
     if directory and not os.path.exists(directory):
         os.makedirs(directory)
 
+    if isinstance(content, bytes):
+        # Raw bodies are archived exactly as received; their encoding is detected when they are parsed
+        mode, encoding = mode.replace("b", "") + "b", None
+        if charset:
+            # The header charset outranks the body's own declaration, so replays need it too
+            with open(f"{file_path}{CHARSET_SUFFIX}", "w", encoding="ascii") as f:
+                f.write(charset)
     with open(file_path, mode, encoding=encoding) as f:
         f.write(content)
+    return file_path
 
 
 def getFile(file_path: str, mode: str = "r") -> Union[str, bytes]:
@@ -41,3 +74,34 @@ def deleteFile(file_path: str) -> bool:
         return False
     except Exception:
         return False
+
+
+def listArchivedFiles(
+    base_dir: str = "downloads",
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+) -> List[ArchivedFile]:
+    """List raw payloads saved by writeFile, oldest first, optionally limited to a time range."""
+    if not os.path.isdir(base_dir):
+        return []
+
+    files = []
+    for name in os.listdir(base_dir):
+        match = ARCHIVE_NAME.match(name)
+        if not match:
+            continue
+        timestamp = datetime.datetime.strptime(match["timestamp"], "%Y%m%d-%H%M")
+        if (since and timestamp < since) or (until and timestamp > until):
+            continue
+        path = os.path.join(base_dir, name)
+        files.append(ArchivedFile(path, match["source"], timestamp, match["content_type"], _read_charset(path)))
+
+    return sorted(files, key=lambda f: (f.timestamp, f.source))
+
+
+def _read_charset(path: str) -> Optional[str]:
+    try:
+        with open(f"{path}{CHARSET_SUFFIX}", "r", encoding="ascii") as f:
+            return f.read().strip() or None
+    except (OSError, UnicodeDecodeError):
+        return None
@@ -0,0 +1,140 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Optional
+
+# Default configuration
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Libraries that are too chatty below WARNING; LOG_LEVELS can still override them
+QUIET_LOGGERS = {"urllib3": "WARNING", "asyncio": "WARNING", "aiohttp": "WARNING"}
+
+# Dictionary to store specific logger configurations
+_logger_levels: Dict[str, int] = {}
+_listener: Optional[QueueListener] = None
+
+
+class Lazy:
+    """
+    Log argument that is only computed when the record is emitted, i.e. not at all when its level is disabled.
+
+    Example:
+        logger.debug("Sample document: %s", Lazy(lambda: pprint.pformat(doc)))
+    """
+
+    __slots__ = ("_build",)
+
+    def __init__(self, build: Callable[[], object]):
+        self._build = build
+
+    def __str__(self) -> str:
+        return str(self._build())
+
+
+def _to_level(level: str) -> Optional[int]:
+    numeric_level = getattr(logging, str(level).upper(), None)
+    return numeric_level if isinstance(numeric_level, int) else None
+
+
+def parse_logger_levels(spec: Optional[str]) -> Dict[str, str]:
+    """Parse ``"agents.parse=DEBUG,aiohttp=WARNING"`` into a logger -> level mapping."""
+    levels = {}
+    for entry in (spec or "").split(","):
+        name, sep, level = entry.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip()
+    return levels
+
+
+def configure_logging(log_level: Optional[str] = None, logger_levels: Optional[Dict[str, str]] = None) -> None:
+    """
+    Configure logging for the entire application.
+
+    Records are formatted by the calling thread, while the state they log still holds the values
+    logged, then put on an in-process queue and written to stdout by a background QueueListener,
+    so the pipeline never blocks on terminal or file I/O.
+
+    Args:
+        log_level: Root log level (DEBUG, INFO, WARNING, ERROR, CRITICAL). Defaults to LOG_LEVEL or INFO.
+        logger_levels: Per-logger overrides. Defaults to LOG_LEVELS, e.g. "agents.parse=DEBUG".
+    """
+    global _listener
+
+    # Determine log level from environment or use default
+    level = log_level or os.environ.get("LOG_LEVEL", DEFAULT_LOG_LEVEL)
+    numeric_level = _to_level(level)
+    if numeric_level is None:
+        print(f"Invalid log level: {level}. Using default: {DEFAULT_LOG_LEVEL}")
+        level, numeric_level = DEFAULT_LOG_LEVEL, _to_level(DEFAULT_LOG_LEVEL)
+
+    root = logging.getLogger()
+    root.setLevel(numeric_level)
+
+    if _listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT))
+
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(log_queue))
+
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+    levels = {**QUIET_LOGGERS, **parse_logger_levels(os.environ.get("LOG_LEVELS")), **(logger_levels or {})}
+    for name, logger_level in levels.items():
+        set_log_level(name, logger_level)
+
+    root.info("Logging configured with level: %s", level)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Get a logger for a specific module with optional custom level
+def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
+    """
+    Get a logger for the specified module name with an optional custom log level.
+
+    Prefer LOG_LEVELS over hard-coding a level here, so verbosity stays configurable in one place.
+
+    Args:
+        name: The module name (typically __name__)
+        level: Optional custom log level for this specific logger
+
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+    if level:
+        set_log_level(name, level)
+    return logger
+
+
+# Set/change the log level for a specific logger
+def set_log_level(name: str, level: str) -> None:
+    """
+    Set or change the log level for a specific named logger.
+
+    Args:
+        name: The logger name
+        level: Log level to set (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    """
+    numeric_level = _to_level(level)
+    if numeric_level is None:
+        logging.error("Invalid log level: %s for logger %s", level, name)
+        return
+
+    logging.getLogger(name).setLevel(numeric_level)
+    _logger_levels[name] = numeric_level
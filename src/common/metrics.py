@@ -0,0 +1,226 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+METRIC_PREFIX = "horizon_scan"
+DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+SIZE_BUCKETS = [1_024, 10_240, 102_400, 512_000, 1_048_576, 5_242_880, 10_485_760, 52_428_800]
+COUNT_BUCKETS = [0, 1, 5, 10, 25, 50, 100, 250, 500, 1_000]
+
+# Metric name -> (help text, buckets)
+HISTOGRAMS: Dict[str, Tuple[str, List[float]]] = {
+    "stage_duration_seconds": ("Wall time spent in a pipeline node", DURATION_BUCKETS),
+    "fetch_dns_seconds": ("DNS lookup time per source", DURATION_BUCKETS),
+    "fetch_connect_seconds": ("TCP/TLS connect time per source", DURATION_BUCKETS),
+    "fetch_transfer_seconds": ("Response transfer time per source", DURATION_BUCKETS),
+    "fetch_duration_seconds": ("Total fetch time per source", DURATION_BUCKETS),
+    "render_seconds": ("Time spent serialising the rendered page", DURATION_BUCKETS),
+    "fetch_bytes": ("Bytes fetched per source", SIZE_BUCKETS),
+    "fetch_blocked_requests": ("Subresource requests blocked by the source's fetch profile", COUNT_BUCKETS),
+    "parse_seconds": ("Parse time per source", DURATION_BUCKETS),
+    "parse_documents": ("Documents produced per source", COUNT_BUCKETS),
+}
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, in the Prometheus sense."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        running = 0
+        # The last count is the overflow bucket, covered by +Inf
+        for bound, count in zip(self.buckets, self.counts[:-1], strict=True):
+            running += count
+            yield _format_value(bound), running
+        yield "+Inf", self.count
+
+
+class MetricsRecorder:
+    """
+    Collects per-stage and per-source measurements for a single scanner run.
+
+    A disabled recorder ignores every call, so instrumented code only pays for an
+    attribute lookup and a branch. Callers that need to compute something before
+    recording (byte counts, timing dicts) should check ``enabled`` first.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._errors: Dict[Tuple[str, str, str], int] = {}
+        self._sources: Dict[str, Dict[str, float]] = {}
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in the named histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+        # Keep running totals for the JSON summary
+        if "source" in labels:
+            totals = self._sources.setdefault(labels["source"], {})
+            totals[name] = totals.get(name, 0) + value
+        elif "stage" in labels:
+            totals = self._stages.setdefault(labels["stage"], {"calls": 0})
+            totals["calls"] += 1
+            totals[name] = totals.get(name, 0) + value
+
+    def error(self, stage: str, error_class: str, source: str = "") -> None:
+        """Count a failure by stage, source and exception class."""
+        if not self.enabled:
+            return
+        key = (stage, source, error_class)
+        self._errors[key] = self._errors.get(key, 0) + 1
+
+    @contextmanager
+    def span(self, stage: str, source: Optional[str] = None, metric: str = "stage_duration_seconds"):
+        """Time the enclosed block and count any exception that escapes it."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.error(stage, type(e).__name__, source or "")
+            raise
+        finally:
+            labels = {"source": source} if source else {"stage": stage}
+            self.observe(metric, time.perf_counter() - start, **labels)
+
+    def summary(self) -> Dict:
+        """Build the JSON run summary."""
+        errors: Dict[str, Dict[str, int]] = {}
+        for (stage, source, error_class), count in self._errors.items():
+            bucket = errors.setdefault(source or stage, {})
+            bucket[error_class] = bucket.get(error_class, 0) + count
+            if source:
+                # Sources that only ever failed still belong in the summary
+                self._sources.setdefault(source, {})
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "stages": {
+                stage: {**{k: round(v, 6) for k, v in totals.items()}, "errors": errors.get(stage, {})}
+                for stage, totals in self._stages.items()
+            },
+            "sources": {
+                source: {**{k: round(v, 6) for k, v in totals.items()}, "errors": errors.get(source, {})}
+                for source, totals in sorted(self._sources.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        by_name: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], Histogram]]] = {}
+        for (name, labels), histogram in self._histograms.items():
+            by_name.setdefault(name, []).append((labels, histogram))
+
+        for name in sorted(by_name):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {HISTOGRAMS[name][0]}")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, histogram in sorted(by_name[name], key=lambda entry: entry[0]):
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+
+        metric = f"{METRIC_PREFIX}_errors_total"
+        lines.append(f"# HELP {metric} Failures by stage, source and exception class")
+        lines.append(f"# TYPE {metric} counter")
+        for (stage, source, error_class), count in sorted(self._errors.items()):
+            labels = (("error_class", error_class), ("source", source), ("stage", stage))
+            lines.append(f"{metric}{_format_labels(labels)} {count}")
+
+        metric = f"{METRIC_PREFIX}_last_run_timestamp_seconds"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {int(time.time())}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: str) -> None:
+        """Write ``scan.prom`` (for the node_exporter textfile collector) and ``run_summary.json``."""
+        if not self.enabled:
+            return
+        os.makedirs(directory, exist_ok=True)
+        _write_atomic(os.path.join(directory, "scan.prom"), self.to_prometheus())
+        _write_atomic(os.path.join(directory, "run_summary.json"), json.dumps(self.summary(), indent=2))
+        logger.info("Metrics written to %s", directory)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _write_atomic(path: str, content: str) -> None:
+    # The textfile collector may read at any time, so never expose a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+_metrics = MetricsRecorder(enabled=False)
+
+
+def configure_metrics(enabled: bool) -> MetricsRecorder:
+    """Replace the process-wide recorder. Call before building the pipeline."""
+    global _metrics
+    _metrics = MetricsRecorder(enabled=enabled)
+    return _metrics
+
+
+def get_metrics() -> MetricsRecorder:
+    return _metrics
+
+
+def instrument_node(name: str, node):
+    """Wrap an async graph node in a timing span. Returns the node unchanged when metrics are off."""
+    if not _metrics.enabled:
+        return node
+
+    @wraps(node)
+    async def timed_node(state):
+        with get_metrics().span(name):
+            return await node(state)
+
+    return timed_node
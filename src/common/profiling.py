@@ -0,0 +1,158 @@
+import asyncio
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from typing import Dict, Optional
+
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 1
+# Keep the profiler's own bookkeeping out of the allocation report. Dropped from the stats rather than filtered
+# out of the snapshot, which would copy every trace
+IGNORED_ALLOCATION_FILES = frozenset({tracemalloc.__file__, __file__, "<unknown>"})
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks (flamegraph.pl format)."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+
+class NodeProfiler:
+    """
+    Accumulates cProfile stats, allocation sites and sampled stacks for one graph node across invocations.
+
+    cProfile, tracemalloc snapshots and the sampler all see the whole thread, so invocations hold the run's
+    lock: concurrent pipeline runs (daemon polls, the consumer) are profiled one node invocation at a time.
+    """
+
+    def __init__(self, name: str, run_dir: str, lock: asyncio.Lock):
+        self.name = name
+        self.run_dir = run_dir
+        self.lock = lock
+        self.invocations = 0
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident())
+
+    async def run(self, node, state):
+        async with self.lock:
+            self.invocations += 1
+            # Traces are only read for this report: starting from none, the snapshot afterwards holds just what the
+            # node allocated and kept, and grouping it never walks the rest of the heap
+            tracemalloc.clear_traces()
+            self.sampler.thread_id = threading.get_ident()
+            self.sampler.start()
+            self.profile.enable()
+            start = time.perf_counter()
+            try:
+                return await node(state)
+            finally:
+                self.profile.disable()
+                self.sampler.stop()
+                elapsed = time.perf_counter() - start
+                self._write(tracemalloc.take_snapshot(), elapsed)
+
+    def _write(self, snapshot, elapsed: float) -> None:
+        # Files are rewritten after every invocation so a killed run still leaves usable output
+        base = os.path.join(self.run_dir, self.name)
+        self.profile.dump_stats(f"{base}.pstats")
+
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in self.sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        stats = snapshot.statistics("lineno")
+        top = [stat for stat in stats if stat.traceback[0].filename not in IGNORED_ALLOCATION_FILES][:TOP_ALLOCATIONS]
+        with open(f"{base}.alloc.txt", "a", encoding="utf-8") as f:
+            f.write(f"== {self.name} invocation {self.invocations}: {elapsed:.3f}s ==\n")
+            for stat in top:
+                f.write(f"{stat}\n")
+            f.write("\n")
+
+        logger.info("Profiled %s invocation %d in %.3fs", self.name, self.invocations, elapsed)
+
+
+class RunProfiler:
+    """Owns the run directory and the per-node profilers for one scanner run."""
+
+    def __init__(self, profile_dir: str):
+        self.run_dir = os.path.join(profile_dir, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.nodes: Dict[str, NodeProfiler] = {}
+        # One for all nodes: a thread has a single profile hook, so two nodes cannot be profiled at once either
+        self.lock = asyncio.Lock()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        logger.info("Profiling enabled, writing to %s", self.run_dir)
+
+    def wrap(self, name: str, node):
+        if name not in self.nodes:
+            self.nodes[name] = NodeProfiler(name, self.run_dir, self.lock)
+        profiler = self.nodes[name]
+
+        @wraps(node)
+        async def profiled_node(state):
+            return await profiler.run(node, state)
+
+        return profiled_node
+
+    def close(self) -> None:
+        tracemalloc.stop()
+
+
+_profiler: Optional[RunProfiler] = None
+
+
+def configure_profiling(profile_dir: Optional[str]) -> Optional[RunProfiler]:
+    """Enable profiling into a new run directory under ``profile_dir``. Call before building the pipeline."""
+    global _profiler
+    _profiler = RunProfiler(profile_dir) if profile_dir else None
+    return _profiler
+
+
+def get_profiler() -> Optional[RunProfiler]:
+    return _profiler
+
+
+def profile_node(name: str, node):
+    """Wrap an async graph node with cProfile, tracemalloc and stack sampling. No-op unless profiling is on."""
+    if _profiler is None:
+        return node
+    return _profiler.wrap(name, node)
@@ -0,0 +1,30 @@
+import importlib
+from typing import Any, Dict, List
+
+
+class LazyRegistry:
+    """
+    Names from scan_config.json mapped to ``"module:attribute"`` paths.
+
+    A module is imported the first time one of its names is loaded, so a scan only pays for the
+    parsers and fetchers (and their dependencies) its config actually uses.
+    """
+
+    def __init__(self, kind: str, entries: Dict[str, str]):
+        self.kind = kind
+        self.entries = entries
+        self._loaded: Dict[str, Any] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def names(self) -> List[str]:
+        return sorted(self.entries)
+
+    def load(self, name: str) -> Any:
+        if name not in self._loaded:
+            if name not in self.entries:
+                raise KeyError(f"Unknown {self.kind} {name!r}, expected one of: {', '.join(self.names())}")
+            module_name, _, attribute = self.entries[name].partition(":")
+            self._loaded[name] = getattr(importlib.import_module(module_name), attribute)
+        return self._loaded[name]
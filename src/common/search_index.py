@@ -0,0 +1,201 @@
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from common.dates import normalize_date, to_iso
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_DB = os.path.join("downloads", "search.db")
+# bm25 weights for title, summary and body: a hit in the title outranks one deep in a PDF
+RANK_WEIGHTS = (10.0, 4.0, 1.0)
+SNIPPET_TOKENS = 12
+# Document fields copied into the index's filter and FTS columns, in table order
+INDEXED_FIELDS = ("source", "issuingAuthority", "regType", "publishedOn", "title", "summary", "linkToRegChangeText")
+
+
+class SearchResult(NamedTuple):
+    score: float
+    publishedOn: Optional[str]
+    source: Optional[str]
+    issuingAuthority: Optional[str]
+    regType: Optional[str]
+    title: Optional[str]
+    link: Optional[str]
+    snippet: str
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index over collected documents.
+
+    ``documents`` holds one row per document with its filter columns; ``documents_fts`` is an
+    external-content FTS5 table over its title, summary and body, kept in sync by triggers.
+    """
+
+    def __init__(self, db_path: str = SEARCH_DB):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                doc_key TEXT NOT NULL UNIQUE,
+                source TEXT,
+                issuingAuthority TEXT,
+                regType TEXT,
+                publishedOn TEXT,
+                title TEXT,
+                summary TEXT,
+                body TEXT,
+                link TEXT,
+                indexed_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_published ON documents (publishedOn);
+            CREATE INDEX IF NOT EXISTS documents_source ON documents (source);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                title, summary, body, content='documents', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts (rowid, title, summary, body)
+                VALUES (new.id, new.title, new.summary, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, title, summary, body)
+                VALUES ('delete', old.id, old.title, old.summary, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, title, summary, body)
+                VALUES ('delete', old.id, old.title, old.summary, old.body);
+                INSERT INTO documents_fts (rowid, title, summary, body)
+                VALUES (new.id, new.title, new.summary, new.body);
+            END;
+            """
+        )
+
+    def add_documents(self, documents: Iterable[Dict]) -> int:
+        """
+        Insert new documents, refresh re-parsed ones and fill in text that has arrived since they were first indexed.
+
+        Unchanged documents are left alone, so re-adding a run's output only touches new and changed rows.
+        Returns the number of rows inserted or updated.
+        """
+        changed = 0
+        now = datetime.now().isoformat()
+        with self.conn:
+            for doc in documents:
+                key = index_key(doc)
+                values = tuple(doc.get(field) for field in INDEXED_FIELDS)
+                row = self.conn.execute(
+                    "SELECT source, issuingAuthority, regType, publishedOn, title, summary, link, body IS NOT NULL "
+                    "FROM documents WHERE doc_key = ?",
+                    (key,),
+                ).fetchone()
+                # Only read the extracted text when the row does not have a body yet
+                body = document_body(doc) if row is None or not row[-1] else None
+                if row is not None and row[:-1] == values and body is None:
+                    continue
+
+                self.conn.execute(
+                    """
+                    INSERT INTO documents (
+                        doc_key, source, issuingAuthority, regType, publishedOn, title, summary, body, link, indexed_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(doc_key) DO UPDATE SET
+                        source = excluded.source,
+                        issuingAuthority = excluded.issuingAuthority,
+                        regType = excluded.regType,
+                        publishedOn = excluded.publishedOn,
+                        title = excluded.title,
+                        summary = excluded.summary,
+                        body = COALESCE(excluded.body, documents.body),
+                        link = excluded.link,
+                        indexed_at = excluded.indexed_at
+                    """,
+                    (key, *values[:6], body, values[6], now),
+                )
+                changed += 1
+        return changed
+
+    def search(
+        self,
+        query: str,
+        source: Optional[str] = None,
+        issuing_authority: Optional[str] = None,
+        reg_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[SearchResult]:
+        """Best matches first. ``query`` is FTS5 syntax; plain words must all match."""
+        clauses = ["documents_fts MATCH ?"]
+        params: List = [query]
+        for column, value in (("source", source), ("issuingAuthority", issuing_authority), ("regType", reg_type)):
+            if value:
+                clauses.append(f"d.{column} = ?")
+                params.append(value)
+        # publishedOn is stored in canonical ISO form, so date ranges are plain text comparisons
+        if since:
+            clauses.append("d.publishedOn >= ?")
+            params.append(_bound(since))
+        if until:
+            clauses.append("d.publishedOn < ?")
+            params.append(_bound(until))
+
+        sql = f"""
+            SELECT bm25(documents_fts, {", ".join(map(str, RANK_WEIGHTS))}) AS score,
+                   d.publishedOn, d.source, d.issuingAuthority, d.regType, d.title, d.link,
+                   snippet(documents_fts, -1, '[', ']', '...', {SNIPPET_TOKENS})
+            FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+            WHERE {" AND ".join(clauses)}
+            ORDER BY score
+            LIMIT ?
+        """
+        try:
+            rows = self.conn.execute(sql, [*params, limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            # Punctuation in a free-text query is FTS5 syntax; search for the words literally instead
+            logger.debug("Query %r is not valid FTS5 (%s), quoting terms", query, e)
+            params[0] = " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+            try:
+                rows = self.conn.execute(sql, [*params, limit]).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning("Cannot search for %r: %s", query, e)
+                return []
+        return [SearchResult(*row) for row in rows]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def index_key(doc: Dict) -> str:
+    # The link identifies a document across runs; listings without links fall back to the state key
+    if doc.get("linkToRegChangeText"):
+        return doc["linkToRegChangeText"]
+    return "|".join(str(doc.get(field) or "") for field in ("source", "title", "publishedOn"))
+
+
+def document_body(doc: Dict) -> Optional[str]:
+    """Full text from the fetch stage: inline content, or the extracted text file for long documents."""
+    if doc.get("htmlContent") or doc.get("pdfContent"):
+        return doc.get("htmlContent") or doc.get("pdfContent")
+    text_path = doc.get("textPath")
+    if text_path and os.path.exists(text_path):
+        with open(text_path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    return None
+
+
+def _bound(value: str) -> str:
+    parsed = normalize_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value}")
+    return to_iso(parsed)
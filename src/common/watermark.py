@@ -0,0 +1,111 @@
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from common.content_store import iter_documents
+from common.dates import normalize_date
+from common.logging import get_logger
+
+logger = get_logger(__name__)
+
+WATERMARK_DB = os.path.join("downloads", "watermarks.db")
+# Links remembered per source, enough to cover a few listing pages of overlap between runs
+MAX_SEEN_LINKS = 1000
+
+
+class WatermarkStore:
+    """Newest publishedOn and recently seen links per config source, persisted across runs and processes."""
+
+    def __init__(self, db_path: str = WATERMARK_DB):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT PRIMARY KEY,
+                watermark TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_links (
+                source TEXT NOT NULL,
+                link TEXT NOT NULL,
+                seen_at TEXT NOT NULL,
+                PRIMARY KEY (source, link)
+            )
+            """
+        )
+
+    def get(self, source: str) -> Optional[datetime]:
+        row = self.conn.execute("SELECT watermark FROM watermarks WHERE source = ?", (source,)).fetchone()
+        return normalize_date(row[0]) if row else None
+
+    def advance(self, watermarks: Dict[str, str]) -> None:
+        """Move each source's watermark forward; values are canonical ISO strings, so text max is time max."""
+        now = datetime.now().isoformat()
+        self.conn.executemany(
+            "INSERT INTO watermarks (source, watermark, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(source) DO UPDATE SET watermark = max(watermark, excluded.watermark), "
+            "updated_at = excluded.updated_at",
+            [(source, watermark, now) for source, watermark in watermarks.items()],
+        )
+        self.conn.commit()
+
+    def seen_links(self, source: str) -> Set[str]:
+        return {row[0] for row in self.conn.execute("SELECT link FROM seen_links WHERE source = ?", (source,))}
+
+    def record_links(self, links: Dict[str, List[str]]) -> None:
+        now = datetime.now().isoformat()
+        for source, source_links in links.items():
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO seen_links (source, link, seen_at) VALUES (?, ?, ?)",
+                # Listings are newest first; inserting oldest first gives the newest links the highest rowids
+                [(source, link, now) for link in reversed(source_links)],
+            )
+            # A run's links share one seen_at, so rowid (reassigned by REPLACE) orders them within it
+            self.conn.execute(
+                "DELETE FROM seen_links WHERE source = ? AND link NOT IN "
+                "(SELECT link FROM seen_links WHERE source = ? ORDER BY seen_at DESC, rowid DESC LIMIT ?)",
+                (source, source, MAX_SEEN_LINKS),
+            )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def failed_sources(documents: List[Dict]) -> Set[str]:
+    """Config sources with a document whose linked content could not be downloaded."""
+    return {
+        doc["scanSource"]
+        for doc in iter_documents(documents)
+        if doc.get("scanSource") and doc.get("contentStatus", "").startswith("error")
+    }
+
+
+def commit_watermarks(state: Dict) -> None:
+    """
+    Persist the watermarks and seen links a finished run collected.
+
+    Call this only once the run's documents are safely stored: a run that dies earlier must
+    parse the same items again next time. Sources with a document whose link failed to download
+    keep their old watermark and links for the same reason.
+    """
+    failed = failed_sources(state.get("documents") or [])
+    if failed:
+        logger.warning("Holding back watermarks for sources with fetch errors: %s", ", ".join(sorted(failed)))
+    watermarks = {source: value for source, value in (state.get("watermarks") or {}).items() if source not in failed}
+    seen_links = {source: links for source, links in (state.get("seen_links") or {}).items() if source not in failed}
+    if not watermarks and not seen_links:
+        return
+    store = WatermarkStore()
+    try:
+        store.advance(watermarks)
+        store.record_links(seen_links)
+    finally:
+        store.close()
+    logger.info("Advanced watermarks for %d sources", len(watermarks))
@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type
+from urllib.parse import urlparse
+
+DEFAULT_QUEUE_URL = "sqlite:///downloads/work_queue.db"
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+@dataclass
+class WorkItem:
+    id: int
+    source: str
+    shard: int
+    payload: Dict
+    attempts: int
+
+
+def shard_for(source: str, num_shards: int) -> int:
+    """Stable shard assignment, identical across processes and hosts."""
+    return zlib.crc32(source.encode("utf-8")) % max(num_shards, 1)
+
+
+class WorkQueue(ABC):
+    """
+    At-least-once work queue with leases.
+
+    A consumer leases an item, processes it and acks it. If the consumer dies or misses its
+    lease deadline the item becomes visible again, so handlers must be idempotent.
+    """
+
+    @abstractmethod
+    def enqueue(self, source: str, payload: Dict, num_shards: int = 1) -> bool:
+        """Add work for a source. Returns False if the source already has pending or leased work."""
+
+    @abstractmethod
+    def lease(self, consumer_id: str, lease_seconds: float, shards: Optional[List[int]] = None) -> Optional[WorkItem]:
+        """Claim the oldest available item, optionally restricted to some shards."""
+
+    @abstractmethod
+    def extend(self, item_id: int, consumer_id: str, lease_seconds: float) -> bool:
+        """Push out the lease deadline of an item this consumer still holds."""
+
+    @abstractmethod
+    def ack(self, item_id: int, consumer_id: str) -> None:
+        """Mark an item as done."""
+
+    @abstractmethod
+    def nack(self, item_id: int, consumer_id: str, error: str) -> None:
+        """Release an item for retry, or park it as failed once it has used up its attempts."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Item counts by status."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release the backend's connections. Optional: backends without any leave this as a no-op."""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Single-file queue backend. Safe across processes on one host; use a shared backend for several nodes."""
+
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_attempts = max_attempts
+        # Autocommit mode so each BEGIN IMMEDIATE below is the only transaction in play
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS work_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                consumer_id TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS work_items_open_source
+                ON work_items(source) WHERE status IN ('pending', 'leased');
+            CREATE INDEX IF NOT EXISTS work_items_available ON work_items(status, shard, id);
+            """
+        )
+
+    def enqueue(self, source: str, payload: Dict, num_shards: int = 1) -> bool:
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO work_items (source, shard, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (source, shard_for(source, num_shards), json.dumps(payload), now, now),
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, consumer_id: str, lease_seconds: float, shards: Optional[List[int]] = None) -> Optional[WorkItem]:
+        now = time.time()
+        shard_filter = f"AND shard IN ({','.join('?' * len(shards))})" if shards else ""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases whose attempts are used up will never succeed; park them
+            self.conn.execute(
+                "UPDATE work_items SET status = 'failed', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = self.conn.execute(
+                f"""
+                SELECT id, source, shard, payload, attempts FROM work_items
+                WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                  AND attempts < ? {shard_filter}
+                ORDER BY id LIMIT 1
+                """,
+                (now, self.max_attempts, *(shards or [])),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+
+            self.conn.execute(
+                "UPDATE work_items SET status = 'leased', attempts = attempts + 1, consumer_id = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (consumer_id, now + lease_seconds, now, row[0]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        item_id, source, shard, payload, attempts = row
+        return WorkItem(id=item_id, source=source, shard=shard, payload=json.loads(payload), attempts=attempts + 1)
+
+    def extend(self, item_id: int, consumer_id: str, lease_seconds: float) -> bool:
+        now = time.time()
+        cursor = self.conn.execute(
+            "UPDATE work_items SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND consumer_id = ? AND status = 'leased'",
+            (now + lease_seconds, now, item_id, consumer_id),
+        )
+        return cursor.rowcount == 1
+
+    def ack(self, item_id: int, consumer_id: str) -> None:
+        self.conn.execute(
+            "UPDATE work_items SET status = 'done', lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND consumer_id = ?",
+            (time.time(), item_id, consumer_id),
+        )
+
+    def nack(self, item_id: int, consumer_id: str, error: str) -> None:
+        self.conn.execute(
+            "UPDATE work_items SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_expires = NULL, last_error = ?, updated_at = ? WHERE id = ? AND consumer_id = ?",
+            (self.max_attempts, error, time.time(), item_id, consumer_id),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# URL scheme -> backend. Register other backends (e.g. a shared database for multi-node runs) here.
+QUEUE_BACKENDS: Dict[str, Type[WorkQueue]] = {
+    "sqlite": SQLiteWorkQueue,
+}
+
+
+def open_work_queue(url: Optional[str] = None) -> WorkQueue:
+    """Open a queue from a URL such as ``sqlite:///downloads/work_queue.db`` (env: WORK_QUEUE_URL)."""
+    url = url or os.environ.get("WORK_QUEUE_URL", DEFAULT_QUEUE_URL)
+    parsed = urlparse(url)
+    backend = QUEUE_BACKENDS.get(parsed.scheme)
+    if backend is None:
+        raise ValueError(f"Unsupported work queue backend: {parsed.scheme}")
+    # sqlite:///relative/path and sqlite:////absolute/path, as in SQLAlchemy URLs
+    return backend(parsed.path[1:] if parsed.path.startswith("/") else parsed.path)
@@ -27,6 +27,11 @@ class Document:
     comments: Optional[str] = None
     enactedDate: Optional[str] = None
     topic: Optional[str] = None
+    contentPath: Optional[str] = None  # Downloaded linkToRegChangeText, set by the fetch stage
+    textPath: Optional[str] = None  # Text extracted from contentPath
+    contentStatus: Optional[str] = None  # fetched, cached or error: <ExceptionClass>
+    indexedAt: Optional[str] = None  # Set once the index stage has added the document to the search index
+    scanSource: Optional[str] = None  # Config source the document was parsed from, set by the parse stage
 
     def to_dict(self) -> Dict[str, Any]:
         return {k: v for k, v in self.__dict__.items() if v is not None}
@@ -1,5 +1,6 @@
-from typing import Annotated, Dict, List, Literal, TypedDict
+from typing import Annotated, Dict, List, Literal, NamedTuple, Optional, TypedDict, Union
 
+from common.content_store import BATCH_KEY, ContentHandle
 from model.document import Document
 
 
@@ -13,6 +14,24 @@ class ParserConfig(TypedDict, total=False):
     parser: Literal["HTML-PARSER", "RSS-PARSER"]  # Now matches the keys in ParserAgent
     tableSelector: str  # Only used for HTML-PARSER
     columns: List[ColumnConfig]  # Only used for HTML-PARSER
+    pageUrlTemplate: str  # HTML-PARSER pagination: URL of page n with {page} for n (2, 3, ...)
+    pageNumberOffset: int  # added to n, e.g. -1 for listings whose second page is ?page=1
+    nextPageSelector: str  # or: the listing's "next page" link, followed one page at a time
+    maxPages: int  # including the first page, default 5
+
+
+class ScheduleConfig(TypedDict, total=False):
+    minInterval: float  # seconds, daemon mode only
+    maxInterval: float
+
+
+class FetchConfig(TypedDict, total=False):
+    backend: Literal["browser", "http"]  # http skips the browser, for feeds and APIs
+    blockResources: List[str]  # Playwright resource types, default image, media, font and stylesheet
+    blockDomains: List[str]  # default: common analytics and ad networks
+    waitUntil: Literal["commit", "domcontentloaded", "load", "networkidle"]
+    waitForSelector: str  # HTML-PARSER sources default to their rowSelector
+    timeout: float  # milliseconds
 
 
 class ScanConfigItem(TypedDict):
@@ -21,26 +40,63 @@ class ScanConfigItem(TypedDict):
     url: str
     parser_config: ParserConfig
     defaults: Dict[str, str]
+    schedule: ScheduleConfig
+    fetch: FetchConfig
+
+
+class RawContent(NamedTuple):
+    url: str
+    content: Union[str, bytes, ContentHandle]  # bytes for XML and JSON, rendered HTML as str
+    content_type: str
+    charset: Optional[str] = None  # from the Content-Type header, when the server sent one
+
+
+def document_key(doc: Dict) -> tuple:
+    if BATCH_KEY in doc:
+        # Spilled batch entry (see common.content_store), identified by its file
+        return BATCH_KEY, doc[BATCH_KEY]
+    return doc.get("source"), doc.get("title"), doc.get("publishedOn")
 
 
 def add_documents(current: List[Document], updated: List[Document]) -> List[Document]:
-    result = current.copy()
+    result = list(current)
+    positions = {document_key(doc): i for i, doc in enumerate(result)}
 
     for new_doc in updated:
-        if not any(
-            doc["source"] == new_doc["source"]
-            and doc["title"] == new_doc["title"]
-            and doc["publishedOn"] == new_doc["publishedOn"]
-            for doc in result
-        ):
+        key = document_key(new_doc)
+        if key in positions:
+            # Later stages (e.g. fetch) send back the same document with extra fields filled in
+            result[positions[key]] = {**result[positions[key]], **new_doc}
+        else:
+            positions[key] = len(result)
             result.append(new_doc)
 
     return result
 
 
+def merge_watermarks(current: Optional[Dict[str, str]], updated: Optional[Dict[str, str]]) -> Dict[str, str]:
+    # Canonical ISO strings (common.dates.to_iso), so the text max is the latest date; None is an empty mapping
+    result = dict(current or {})
+    for source, watermark in (updated or {}).items():
+        result[source] = max(result.get(source, watermark), watermark)
+    return result
+
+
+def merge_seen_links(
+    current: Optional[Dict[str, List[str]]], updated: Optional[Dict[str, List[str]]]
+) -> Dict[str, List[str]]:
+    result = dict(current or {})
+    for source, links in (updated or {}).items():
+        result[source] = list(dict.fromkeys(result.get(source, []) + links))
+    return result
+
+
 class State(TypedDict):
     scan_config: List[ScanConfigItem]
     batch_size: int
     current_batch: int
-    raw_content: Dict[str, str]
+    raw_content: Dict[str, RawContent]
     documents: Annotated[List[Document], add_documents]
+    watermarks: Annotated[Dict[str, str], merge_watermarks]  # config source -> newest publishedOn parsed this run
+    seen_links: Annotated[Dict[str, List[str]], merge_seen_links]  # config source -> links parsed this run
+    prefetched_batch: Optional[int]  # set when resuming a run whose raw content for this batch was checkpointed
@@ -0,0 +1,73 @@
+import json
+from typing import Dict, List
+
+from agents.download.profile import fetch_profile
+from agents.parse.registry import PARSERS
+
+# Only the registries and config helpers are imported here: checking a config must not load Playwright,
+# LangGraph or any parser backend.
+
+
+def check_scan_config(config_file: str) -> List[str]:
+    """Problems found in a scan config file, one message per problem; empty when the config is usable."""
+    try:
+        with open(config_file, "r") as f:
+            config_data = json.load(f)
+    except (OSError, ValueError) as e:
+        return [f"{config_file}: {e}"]
+    if not isinstance(config_data, list):
+        return [f"{config_file}: expected a list of sources"]
+
+    problems = []
+    seen = set()
+    for position, item in enumerate(config_data):
+        if not isinstance(item, dict):
+            problems.append(f"item {position}: expected an object")
+            continue
+        name = item.get("source") or f"item {position}"
+        problems.extend(f"{name}: {problem}" for problem in _check_item(item))
+        if item.get("source") in seen:
+            problems.append(f"{name}: duplicate source")
+        seen.add(item.get("source"))
+    return problems
+
+
+def _check_item(item: Dict) -> List[str]:
+    problems = [f"missing {key}" for key in ("source", "url") if not item.get(key)]
+
+    parser_config = item.get("parser_config", {})
+    parser = parser_config.get("parser")
+    if parser not in PARSERS:
+        problems.append(f"parser_config.parser must be one of {', '.join(PARSERS.names())}, got {parser!r}")
+    if parser == "HTML-PARSER":
+        if not parser_config.get("rowSelector"):
+            problems.append("HTML-PARSER needs parser_config.rowSelector")
+        columns = parser_config.get("columns") or []
+        if not columns:
+            problems.append("HTML-PARSER needs parser_config.columns")
+        problems.extend(
+            f"column {i} needs a name and a selector"
+            for i, column in enumerate(columns)
+            if not column.get("name") or not column.get("selector")
+        )
+        template = parser_config.get("pageUrlTemplate")
+        if template is not None and "{page}" not in template:
+            problems.append("parser_config.pageUrlTemplate needs a {page} placeholder")
+        max_pages = parser_config.get("maxPages", 1)
+        if not isinstance(max_pages, int) or max_pages < 1:
+            problems.append("parser_config.maxPages must be a positive integer")
+    elif "pageUrlTemplate" in parser_config or "nextPageSelector" in parser_config:
+        problems.append("pagination is only supported for HTML-PARSER")
+
+    try:
+        fetch_profile({"source": item.get("source"), **item})
+    except (ValueError, TypeError) as e:
+        problems.append(str(e).split(": ", 1)[-1])
+
+    schedule = item.get("schedule", {})
+    bounds = [schedule.get(key) for key in ("minInterval", "maxInterval")]
+    if any(value is not None and (not isinstance(value, (int, float)) or value <= 0) for value in bounds):
+        problems.append("schedule intervals must be positive numbers of seconds")
+    elif None not in bounds and bounds[0] > bounds[1]:
+        problems.append("schedule.minInterval is larger than schedule.maxInterval")
+    return problems
@@ -1,31 +1,54 @@
-from langgraph.graph import END, StateGraph
-
 from agents.download.downloader import download_agent
+from agents.fetch import fetch_agent
+from agents.index import index_agent
 from agents.parse.parser_agent import ParserAgent
+from common.checkpoint import checkpoint_node
+from common.metrics import instrument_node
+from common.profiling import profile_node
+from common.watermark import WatermarkStore
 from model.state import State
 
 
-def build_producer_pipeline():
-    parser_agent = ParserAgent()
+def _node(name: str, node, completes_batch: bool = False):
+    # Checkpoint, metrics and profiling hooks all return the node untouched when they are switched off.
+    # Profiling wraps the metrics span so its snapshots and report writing are not counted as stage time.
+    return checkpoint_node(name, profile_node(name, instrument_node(name, node)), completes_batch)
+
+
+def build_producer_pipeline(use_watermarks: bool = True):
+    # LangGraph is only needed once a pipeline is actually built
+    from langgraph.graph import END, StateGraph
+
+    # Without watermarks every run parses each listing in full (backfills, config changes)
+    watermarks = WatermarkStore() if use_watermarks else None
+    parser_agent = ParserAgent(watermarks)
+
+    async def download(state):
+        # Paginated listings stop fetching at the first page with nothing new since the last run
+        return await download_agent(state, watermarks)
 
     # Define workflow
     workflow = StateGraph(State)
 
     # Add nodes
-    workflow.add_node("download", download_agent)
-    workflow.add_node("parse", parser_agent.parse_content)
+    workflow.add_node("download", _node("download", download))
+    workflow.add_node("parse", _node("parse", parser_agent.parse_content))
+    workflow.add_node("fetch", _node("fetch", fetch_agent))
+    workflow.add_node("index", _node("index", index_agent, completes_batch=True))
 
     # Set entry point
     workflow.set_entry_point("download")
 
     # Define flow
     workflow.add_edge("download", "parse")
+    workflow.add_edge("parse", "fetch")
+    workflow.add_edge("fetch", "index")
 
-    # Conditional continuation for download batches
+    # Conditional continuation for download batches, once the current batch has gone through every stage
     def should_continue(state):
         return "download" if state["current_batch"] * state["batch_size"] < len(state["scan_config"]) else END
 
-    workflow.add_conditional_edges("download", should_continue)
+    workflow.add_conditional_edges("index", should_continue)
 
     # Compile the workflow
     return workflow.compile()
@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import pairwise
+from typing import Dict, List, Optional
+
+from agents.download.browser import warm_browser
+from agents.download.profile import uses_browser
+from common.content_store import iter_documents, load_content
+from common.dates import normalize_date
+from common.logging import get_logger
+from common.watermark import commit_watermarks
+from model.state import ScanConfigItem
+
+logger = get_logger(__name__)
+
+SCHEDULE_FILE = os.path.join("downloads", "schedule.json")
+DEFAULT_MIN_INTERVAL = 300.0  # seconds
+DEFAULT_MAX_INTERVAL = 86_400.0
+DEFAULT_INITIAL_INTERVAL = 3_600.0
+POLLS_PER_PUBLISH = 2  # poll about twice per typical gap between publications
+MAX_GAP_HISTORY = 20
+UNCHANGED_SMOOTHING = 0.3  # weight of the latest poll in the unchanged-rate moving average
+MAX_CONCURRENT_SOURCES = 4
+MAX_IDLE_SLEEP = 60.0
+
+
+@dataclass
+class SourceSchedule:
+    source: str
+    interval: float = DEFAULT_INITIAL_INTERVAL
+    next_run: float = 0.0
+    last_hash: Optional[str] = None
+    last_published: Optional[str] = None
+    publish_gaps: List[float] = field(default_factory=list)
+    unchanged_rate: float = 0.0
+    polls: int = 0
+
+    def record_poll(self, content_hash: Optional[str], published: List[datetime], bounds: Dict[str, float]) -> None:
+        """Adapt the polling interval to what this poll found, within the source's configured bounds."""
+        min_interval = float(bounds.get("minInterval", DEFAULT_MIN_INTERVAL))
+        max_interval = float(bounds.get("maxInterval", DEFAULT_MAX_INTERVAL))
+
+        # An identical body is our equivalent of a 304 Not Modified
+        unchanged = content_hash is not None and content_hash == self.last_hash
+        self.unchanged_rate += UNCHANGED_SMOOTHING * ((1.0 if unchanged else 0.0) - self.unchanged_rate)
+        if content_hash is not None:
+            self.last_hash = content_hash
+
+        last_seen = normalize_date(self.last_published)
+        new_items = sorted(ts for ts in published if last_seen is None or ts > last_seen)
+        if new_items:
+            previous = [last_seen] if last_seen else []
+            points = previous + new_items
+            self.publish_gaps.extend((b - a).total_seconds() for a, b in pairwise(points) if b > a)
+            self.publish_gaps = self.publish_gaps[-MAX_GAP_HISTORY:]
+            self.last_published = new_items[-1].isoformat()
+
+        if new_items and self.publish_gaps:
+            interval = statistics.median(self.publish_gaps) / POLLS_PER_PUBLISH
+        elif new_items:
+            interval = self.interval
+        else:
+            # Nothing new: back off, faster for sources that keep returning the same body
+            interval = self.interval * (1.0 + max(self.unchanged_rate, 0.25))
+
+        self.interval = min(max(interval, min_interval), max_interval)
+        self.polls += 1
+        self.next_run = time.time() + self.interval
+
+
+def load_schedules(path: str = SCHEDULE_FILE) -> Dict[str, SourceSchedule]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return {source: SourceSchedule(**entry) for source, entry in json.load(f).items()}
+
+
+def save_schedules(schedules: Dict[str, SourceSchedule], path: str = SCHEDULE_FILE) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({source: asdict(schedule) for source, schedule in schedules.items()}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class Scheduler:
+    """Polls each configured source on its own adaptive interval using one long-lived pipeline and browser."""
+
+    def __init__(self, pipeline, scan_config: List[ScanConfigItem], on_cycle=None):
+        self.pipeline = pipeline
+        self.scan_config = scan_config
+        self.on_cycle = on_cycle
+        # Sources dropped from the config are forgotten, otherwise their overdue next_run would keep the loop awake
+        saved = load_schedules()
+        self.schedules = {
+            item["source"]: saved.get(item["source"], SourceSchedule(source=item["source"])) for item in scan_config
+        }
+        self._stop = asyncio.Event()
+        self._limit = asyncio.Semaphore(MAX_CONCURRENT_SOURCES)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def run_forever(self) -> None:
+        async with warm_browser() if uses_browser(self.scan_config) else contextlib.nullcontext():
+            while not self._stop.is_set():
+                now = time.time()
+                due = [item for item in self.scan_config if self.schedules[item["source"]].next_run <= now]
+                if due:
+                    logger.info("Polling %d due sources: %s", len(due), ", ".join(item["source"] for item in due))
+                    await asyncio.gather(*(self._poll(item) for item in due))
+                    save_schedules(self.schedules)
+                    if self.on_cycle:
+                        self.on_cycle()
+
+                next_run = min(
+                    (self.schedules[item["source"]].next_run for item in self.scan_config),
+                    default=time.time() + MAX_IDLE_SLEEP,
+                )
+                sleep_for = min(max(next_run - time.time(), 0.0), MAX_IDLE_SLEEP)
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stop.wait(), timeout=sleep_for)
+
+    async def _poll(self, item: ScanConfigItem) -> None:
+        schedule = self.schedules[item["source"]]
+        initial_state = {
+            "scan_config": [item],
+            "batch_size": 1,
+            "current_batch": 0,
+            "raw_content": {},
+            "documents": [],
+            "watermarks": {},
+            "seen_links": {},
+        }
+        content_hash = None
+        published: List[datetime] = []
+        async with self._limit:
+            try:
+                state = await self.pipeline.ainvoke(initial_state)
+                commit_watermarks(state)
+                content_hash = _hash_raw_content(state["raw_content"])
+                published = [
+                    ts for doc in iter_documents(state["documents"]) if (ts := normalize_date(doc.get("publishedOn")))
+                ]
+            except Exception as e:
+                logger.error("Polling %s failed: %s", item["source"], e)
+
+        schedule.record_poll(content_hash, published, item.get("schedule", {}))
+        logger.info(
+            "%s: %d dated documents, next poll in %.0fs (unchanged rate %.2f)",
+            item["source"],
+            len(published),
+            schedule.interval,
+            schedule.unchanged_rate,
+        )
+
+
+def _hash_raw_content(raw_content: Dict) -> Optional[str]:
+    digest = hashlib.sha256()
+    for source in sorted(raw_content):
+        content = raw_content[source].content
+        content = load_content(content)
+        if isinstance(content, str):
+            if content.startswith("Error:"):
+                # A failed fetch says nothing about whether the source changed
+                return None
+            content = content.encode("utf-8")
+        digest.update(content)
+    return digest.hexdigest()
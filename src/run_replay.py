@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from agents.parse.parser_agent import ParserAgent
+from common.config import find_source_config, load_producer_config
+from common.file import BINARY_CONTENT_TYPES, ArchivedFile, listArchivedFiles
+from common.logging import configure_logging, get_logger
+from model.state import ScanConfigItem, add_documents, document_key
+
+logger = get_logger(__name__)
+
+REPLAY_DIR = os.path.join("output", "replay")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-parse archived raw content without any network access")
+    parser.add_argument("--config", default="config/scan_config.json", help="Scan config naming each source's parser")
+    parser.add_argument("--archive-dir", default="downloads", help="Directory written by store_content")
+    parser.add_argument("--source", action="append", help="Only replay this config source (repeatable)")
+    parser.add_argument("--since", type=parse_timestamp, help="Earliest archive time, YYYY-MM-DD or YYYYmmdd-HHMM")
+    parser.add_argument("--until", type=parse_timestamp, help="Latest archive time, YYYY-MM-DD or YYYYmmdd-HHMM")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes to use")
+    parser.add_argument("--output", help="Where to write the replayed documents (default output/replay/<time>.json)")
+    parser.add_argument("--diff", metavar="PREVIOUS", help="Compare the output with an earlier replay output")
+    parser.add_argument("--log-level", default=None, help="Root log level (env: LOG_LEVEL, default INFO)")
+    return parser.parse_args(argv)
+
+
+def parse_timestamp(value: str) -> datetime:
+    for fmt in ("%Y%m%d-%H%M", "%Y-%m-%d", "%Y-%m-%dT%H:%M"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Invalid timestamp: {value}")
+
+
+def select_files(
+    files: List[ArchivedFile], scan_config: List[ScanConfigItem], sources: Optional[List[str]]
+) -> List[ArchivedFile]:
+    selected = []
+    for archived in files:
+        source_config = find_source_config(archived.source, scan_config)
+        if source_config is None:
+            logger.debug("Skipping %s: no scan config for %s", archived.path, archived.source)
+        elif not sources or source_config["source"] in sources:
+            selected.append(archived)
+    return selected
+
+
+async def parse_files(files: List[ArchivedFile], scan_config: List[ScanConfigItem]) -> List[Dict]:
+    agent = ParserAgent()
+    documents = []
+    for archived in files:
+        content = read_archived(archived)
+        if isinstance(content, str) and content.startswith("Error:"):
+            # The original fetch failed; there is nothing to parse
+            continue
+        try:
+            parsed = await agent.parse_source(archived.source, None, content, scan_config, archived.charset)
+        except Exception as e:
+            logger.error("Failed to replay %s: %s", archived.path, e)
+            continue
+        documents.extend(doc.to_dict() for doc in parsed)
+    return documents
+
+
+def read_archived(archived: ArchivedFile) -> Union[str, bytes]:
+    # Feeds and API responses are archived as raw bytes (see writeFile); rendered HTML as UTF-8 text
+    with open(archived.path, "rb") as f:
+        content = f.read()
+    if archived.content_type in BINARY_CONTENT_TYPES and not content.startswith(b"Error:"):
+        return content
+    return content.decode("utf-8", errors="replace")
+
+
+def parse_files_in_worker(files: List[ArchivedFile], scan_config: List[ScanConfigItem]) -> List[Dict]:
+    return asyncio.run(parse_files(files, scan_config))
+
+
+def replay(files: List[ArchivedFile], scan_config: List[ScanConfigItem], workers: int) -> List[Dict]:
+    if workers <= 1 or len(files) <= 1:
+        return add_documents([], parse_files_in_worker(files, scan_config))
+
+    # Parsing is CPU-bound, so spread files over processes rather than tasks
+    chunks = [files[i::workers] for i in range(workers) if files[i::workers]]
+    documents: List[Dict] = []
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=multiprocessing.get_context("spawn")) as pool:
+        for chunk_documents in pool.map(parse_files_in_worker, chunks, [scan_config] * len(chunks)):
+            documents = add_documents(documents, chunk_documents)
+    return documents
+
+
+def diff_documents(previous: List[Dict], current: List[Dict]) -> Dict:
+    previous_by_key = {document_key(doc): doc for doc in previous}
+    current_by_key = {document_key(doc): doc for doc in current}
+
+    changed = []
+    for key in previous_by_key.keys() & current_by_key.keys():
+        before, after = previous_by_key[key], current_by_key[key]
+        fields = sorted(field for field in before.keys() | after.keys() if before.get(field) != after.get(field))
+        if fields:
+            changed.append({"key": list(key), "fields": fields})
+
+    return {
+        "added": [list(key) for key in current_by_key.keys() - previous_by_key.keys()],
+        "removed": [list(key) for key in previous_by_key.keys() - current_by_key.keys()],
+        "changed": changed,
+    }
+
+
+def write_json(path: str, data) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+
+    scan_config = load_producer_config(args.config)
+    files = select_files(listArchivedFiles(args.archive_dir, args.since, args.until), scan_config, args.source)
+    logger.info("Replaying %d archived files with %d workers", len(files), args.workers)
+
+    start = time.perf_counter()
+    documents = replay(files, scan_config, args.workers)
+    elapsed = time.perf_counter() - start
+    logger.info("Parsed %d documents from %d files in %.2fs", len(documents), len(files), elapsed)
+
+    output = args.output or os.path.join(REPLAY_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    write_json(output, documents)
+    logger.info("Wrote replay output to %s", output)
+
+    if args.diff:
+        with open(args.diff, "r", encoding="utf-8") as f:
+            diff = diff_documents(json.load(f), documents)
+        diff_path = f"{os.path.splitext(output)[0]}.diff.json"
+        write_json(diff_path, diff)
+        logger.info(
+            "Diff against %s: %d added, %d removed, %d changed (details in %s)",
+            args.diff,
+            len(diff["added"]),
+            len(diff["removed"]),
+            len(diff["changed"]),
+            diff_path,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,153 @@
+import argparse
 import asyncio
+import contextlib
 import json
+import os
+import signal
+import sys
+from datetime import datetime
 
+from agents.download.browser import warm_browser
+from agents.download.profile import uses_browser
+from agents.fetch import shutdown_pool
+from common.checkpoint import CheckpointStore, configure_checkpoints
 from common.config import load_producer_config
-from common.logging_config import configure_logging, get_logger
-from pipelines.pipeline import build_producer_pipeline
+from common.content_store import count_documents
+from common.logging import Lazy, configure_logging, get_logger
+from common.metrics import configure_metrics, get_metrics
+from common.profiling import configure_profiling
+from common.watermark import commit_watermarks
+from pipelines.config_check import check_scan_config
 
-# Configure logging for the application
-configure_logging()
 logger = get_logger(__name__)
 
 
-async def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scan configured regulatory sources for new documents")
+    parser.add_argument("--log-level", default=None, help="Root log level (env: LOG_LEVEL, default INFO)")
+    parser.add_argument(
+        "--metrics-dir",
+        default=os.environ.get("SCAN_METRICS_DIR"),
+        help="Write scan.prom and run_summary.json here (env: SCAN_METRICS_DIR). Metrics are off when unset.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=os.environ.get("SCAN_PROFILE_DIR"),
+        help="Profile every pipeline node into a run directory here (env: SCAN_PROFILE_DIR).",
+    )
+    parser.add_argument("--resume", metavar="RUN_ID", help="Continue an interrupted run from its last checkpoint")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and poll each source on its own adaptive interval instead of scanning once.",
+    )
+    parser.add_argument("--config", default="config/scan_config.json", help="Scan config file")
+    parser.add_argument(
+        "--check-config",
+        action="store_true",
+        help="Validate the scan config and exit, without loading the browser, pipeline or parsers.",
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Parse every listed item instead of stopping at each source's watermark from earlier runs.",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace):
+    configure_metrics(enabled=bool(args.metrics_dir))
+    profiler = configure_profiling(args.profile_dir)
+
     # Load the scan config
-    scan_config = load_producer_config("config/scan_config.json")
+    scan_config = load_producer_config(args.config)
 
     # Debug: log the loaded config
-    logger.debug(f"Loaded scan config: {json.dumps(scan_config, indent=2)}")
+    logger.debug("Loaded scan config: %s", Lazy(lambda: json.dumps(scan_config, indent=2)))
+
+    # Single runs are checkpointed after every node; the daemon re-polls sources instead
+    run_id = args.resume or datetime.now().strftime("%Y%m%d-%H%M%S")
+    checkpoints = None if args.daemon else configure_checkpoints(run_id)
+    # Imported here so --check-config and --help never load LangGraph and the pipeline nodes
+    from pipelines.pipeline import build_producer_pipeline
 
-    pipeline = build_producer_pipeline()
+    pipeline = build_producer_pipeline(use_watermarks=not args.full_scan)
 
-    initial_state = {
-        "scan_config": scan_config,
-        "batch_size": 2,
-        "current_batch": 0,
-        "raw_content": {},
-        "documents": {},  # Changed to dict to match State TypedDict in state.py
-    }
+    try:
+        if args.daemon:
+            await run_daemon(pipeline, scan_config, args)
+        else:
+            await run_once(pipeline, scan_config, checkpoints, resume=bool(args.resume))
+    finally:
+        if checkpoints:
+            checkpoints.close()
+        get_metrics().export(args.metrics_dir)
+        if profiler:
+            profiler.close()
+        shutdown_pool()
+
+
+async def run_daemon(pipeline, scan_config, args: argparse.Namespace):
+    from pipelines.scheduler import Scheduler
+
+    scheduler = Scheduler(pipeline, scan_config, on_cycle=lambda: get_metrics().export(args.metrics_dir))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, scheduler.stop)
+
+    logger.info("Starting scanner daemon for %d sources", len(scan_config))
+    await scheduler.run_forever()
+    logger.info("Scanner daemon stopped")
+
+
+async def run_once(pipeline, scan_config, checkpoints: CheckpointStore, resume: bool = False):
+    if resume:
+        initial_state = checkpoints.resume_state()
+        if initial_state is None:
+            logger.info("Run %s already completed, nothing to resume", checkpoints.run_id)
+            return
+    else:
+        initial_state = {
+            "scan_config": scan_config,
+            "batch_size": 2,
+            "current_batch": 0,
+            "raw_content": {},
+            "documents": {},  # Changed to dict to match State TypedDict in state.py
+            "watermarks": {},
+            "seen_links": {},
+        }
+        logger.info("Starting run %s (resume with --resume %s)", checkpoints.run_id, checkpoints.run_id)
 
     # Log initial state (without large content)
-    logger.info(f"Initial state structure: scan_config length={len(initial_state['scan_config'])}")
+    logger.info("Initial state structure: scan_config length=%d", len(initial_state["scan_config"]))
 
-    state = await pipeline.ainvoke(initial_state)
+    # Every batch opens its pages in one warm browser; runs whose sources all use plain HTTP never start Chrome
+    async with warm_browser() if uses_browser(initial_state["scan_config"]) else contextlib.nullcontext():
+        state = await pipeline.ainvoke(initial_state)
+    checkpoints.complete()
+    commit_watermarks(state)
 
-    # Check the documents in the final state
+    # Check the documents in the final state, counting spilled batches without loading them
     doc_count = (
-        len(state["documents"])
+        count_documents(state["documents"])
         if isinstance(state["documents"], list)
         else sum(len(docs) for docs in state["documents"].values())
     )
-    logger.info(f"Processed {doc_count} documents")
+    logger.info("Processed %d documents", doc_count)
+
+
+def check_config(config_file: str) -> int:
+    problems = check_scan_config(config_file)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    print(f"{config_file}: {len(problems)} problems" if problems else f"{config_file}: OK")
+    return 1 if problems else 0
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.check_config:
+        sys.exit(check_config(args.config))
+    # Configure logging for the application
+    configure_logging(args.log_level)
+    asyncio.run(main(args))
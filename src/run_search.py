@@ -0,0 +1,88 @@
+import argparse
+import json
+import time
+from typing import Dict, List
+
+from common.dates import normalize_date
+from common.logging import configure_logging, get_logger
+from common.search_index import SEARCH_DB, SearchIndex
+
+logger = get_logger(__name__)
+
+
+def parse_date(value: str) -> str:
+    if normalize_date(value) is None:
+        raise argparse.ArgumentTypeError(f"Invalid date: {value}")
+    return value
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search documents collected by earlier scans")
+    parser.add_argument("query", nargs="?", help='FTS5 query, e.g. "basel III endgame" or NEAR(capital buffer, 5)')
+    parser.add_argument("--source", help="Only documents from this source")
+    parser.add_argument("--authority", help="Only documents with this issuingAuthority")
+    parser.add_argument("--reg-type", help="Only documents with this regType")
+    parser.add_argument("--since", type=parse_date, help="Published on or after this date, e.g. 2025-01-01")
+    parser.add_argument("--until", type=parse_date, help="Published before this date")
+    parser.add_argument("--limit", type=int, default=20, help="Number of results to show")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--db", default=SEARCH_DB, help="Search index database")
+    parser.add_argument(
+        "--load",
+        action="append",
+        metavar="FILE",
+        help="Add documents from a JSON output file (output/documents, output/replay) first; repeatable",
+    )
+    parser.add_argument("--log-level", default=None, help="Root log level (env: LOG_LEVEL, default INFO)")
+    args = parser.parse_args(argv)
+    if not args.query and not args.load:
+        parser.error("a query or --load is required")
+    return args
+
+
+def load_files(index: SearchIndex, paths: List[str]) -> None:
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            documents: List[Dict] = json.load(f)
+        changed = index.add_documents(documents)
+        logger.info("Loaded %s: %d documents, %d new or updated", path, len(documents), changed)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+
+    index = SearchIndex(args.db)
+    try:
+        if args.load:
+            load_files(index, args.load)
+        if not args.query:
+            return
+
+        start = time.perf_counter()
+        results = index.search(
+            args.query,
+            source=args.source,
+            issuing_authority=args.authority,
+            reg_type=args.reg_type,
+            since=args.since,
+            until=args.until,
+            limit=args.limit,
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        index.close()
+
+    if args.json:
+        print(json.dumps([result._asdict() for result in results], ensure_ascii=False, indent=2))
+        return
+
+    for result in results:
+        print(f"{result.publishedOn or '':<20}  {result.source or '':<24}  {result.title}")
+        print(f"{'':<20}  {result.link or ''}")
+        print(f"{'':<20}  {' '.join(result.snippet.split())}")
+    print(f"{len(results)} results in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import signal
+import socket
+
+from agents.download.browser import warm_browser
+from agents.download.profile import uses_browser
+from agents.fetch import shutdown_pool
+from agents.persist import persist_documents
+from common.content_store import iter_documents
+from common.logging import configure_logging, get_logger
+from common.watermark import commit_watermarks
+from common.work_queue import DEFAULT_LEASE_SECONDS, WorkItem, WorkQueue, open_work_queue
+from pipelines.pipeline import build_producer_pipeline
+
+logger = get_logger(__name__)
+
+IDLE_POLL_SECONDS = 5.0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lease source work items, download, parse and write results")
+    parser.add_argument("--queue", default=None, help="Work queue URL (env: WORK_QUEUE_URL)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of consumer processes to run on this node")
+    parser.add_argument("--shards", default=None, help="Comma-separated shard numbers to consume, default all")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS, help="Lease length per item")
+    parser.add_argument("--drain", action="store_true", help="Exit once the queue has no available work")
+    parser.add_argument("--log-level", default=None, help="Root log level (env: LOG_LEVEL, default INFO)")
+    args = parser.parse_args(argv)
+    args.shards = [int(shard) for shard in args.shards.split(",")] if args.shards else None
+    return args
+
+
+async def keep_lease(queue: WorkQueue, item: WorkItem, consumer_id: str, lease_seconds: float) -> None:
+    # Renew well before the deadline so a slow source is not handed to a second consumer
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not queue.extend(item.id, consumer_id, lease_seconds):
+            logger.warning("Lost lease on %s (item %d)", item.source, item.id)
+            return
+
+
+async def process_item(pipeline, queue: WorkQueue, item: WorkItem, consumer_id: str, lease_seconds: float) -> None:
+    initial_state = {
+        "scan_config": [item.payload],
+        "batch_size": 1,
+        "current_batch": 0,
+        "raw_content": {},
+        "documents": [],
+        "watermarks": {},
+        "seen_links": {},
+    }
+    heartbeat = asyncio.create_task(keep_lease(queue, item, consumer_id, lease_seconds))
+    try:
+        state = await pipeline.ainvoke(initial_state)
+    finally:
+        heartbeat.cancel()
+    persist_documents(item.source, list(iter_documents(state["documents"])))
+    commit_watermarks(state)
+
+
+async def consume(args: argparse.Namespace) -> None:
+    consumer_id = f"{socket.gethostname()}-{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    pipeline = build_producer_pipeline()
+    queue = open_work_queue(args.queue)
+    logger.info("Consumer %s started (shards: %s)", consumer_id, args.shards or "all")
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            browser_warm = False
+            while not stop.is_set():
+                item = queue.lease(consumer_id, args.lease_seconds, args.shards)
+                if item is None:
+                    if args.drain:
+                        break
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(stop.wait(), timeout=IDLE_POLL_SECONDS)
+                    continue
+
+                logger.info("Processing %s (item %d, attempt %d)", item.source, item.id, item.attempts)
+                try:
+                    # Chrome starts with the first browser source, so http-only consumers never launch it
+                    if not browser_warm and uses_browser([item.payload]):
+                        await stack.enter_async_context(warm_browser())
+                        browser_warm = True
+                    await process_item(pipeline, queue, item, consumer_id, args.lease_seconds)
+                    queue.ack(item.id, consumer_id)
+                except Exception as e:
+                    logger.error("Failed to process %s: %s", item.source, e)
+                    queue.nack(item.id, consumer_id, f"{type(e).__name__}: {e}")
+    finally:
+        queue.close()
+        shutdown_pool()
+        logger.info("Consumer %s stopped", consumer_id)
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    configure_logging(args.log_level)
+    asyncio.run(consume(args))
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.workers <= 1:
+        run_worker(args)
+        return
+
+    # Each worker gets its own event loop, browser and queue connection
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=run_worker, args=(args,), name=f"consumer-{i}") for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
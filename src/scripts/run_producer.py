@@ -0,0 +1,34 @@
+import argparse
+
+from common.config import load_producer_config
+from common.logging import configure_logging, get_logger
+from common.work_queue import open_work_queue
+
+logger = get_logger(__name__)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Enqueue one fetch work item per configured source")
+    parser.add_argument("--config", default="config/scan_config.json", help="Scan config to enqueue")
+    parser.add_argument("--queue", default=None, help="Work queue URL (env: WORK_QUEUE_URL)")
+    parser.add_argument("--shards", type=int, default=1, help="Number of shards to spread sources over")
+    parser.add_argument("--log-level", default=None, help="Root log level (env: LOG_LEVEL, default INFO)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+
+    scan_config = load_producer_config(args.config)
+    queue = open_work_queue(args.queue)
+    try:
+        enqueued = sum(queue.enqueue(item["source"], item, args.shards) for item in scan_config)
+        # Sources that still have pending or leased work are not enqueued twice
+        logger.info("Enqueued %d of %d sources, queue status: %s", enqueued, len(scan_config), queue.stats())
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import json
+import sqlite3
+
+from common.checkpoint import CheckpointStore
+from model.state import RawContent
+
+
+def _state(batch, documents, raw_content=None):
+    return {
+        "scan_config": [{"source": "A"}, {"source": "B"}],
+        "batch_size": 1,
+        "current_batch": batch,
+        "raw_content": raw_content or {},
+        "documents": documents,
+        "watermarks": {"A": "2025-03-05T00:00:00Z"},
+        "seen_links": {},
+    }
+
+
+def _chunks(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT chunk, complete, size FROM run_documents ORDER BY chunk").fetchall()
+
+
+def test_completed_batches_are_not_rewritten_and_resume_restores_every_document(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+    first = [{"title": "a1"}, {"title": "a2"}]
+    second = [{"title": "b1"}]
+
+    store = CheckpointStore("run", db_path)
+    store.save("parse", _state(1, first), batch_complete=False)
+    store.save("index", _state(1, first), batch_complete=True)
+    store.save("download", _state(2, first, {"B": RawContent("u", b"<feed/>", "xml")}), batch_complete=False)
+    store.save("parse", _state(2, first + second, {"B": RawContent("u", b"<feed/>", "xml")}), batch_complete=False)
+    store.close()
+    assert _chunks(db_path) == [(0, 1, 2), (1, 0, 1)]
+
+    # A resumed run keeps appending after the stored chunks
+    store = CheckpointStore("run", db_path)
+    state = store.resume_state()
+    assert state["documents"] == first + second
+    assert state["raw_content"]["B"].content == b"<feed/>"
+    assert (state["current_batch"], state["prefetched_batch"]) == (1, 1)
+    store.save("index", _state(2, first + second), batch_complete=True)
+    assert _chunks(db_path) == [(0, 1, 2), (1, 1, 1)]
+
+    store.complete()
+    assert store.resume_state() is None
+    assert _chunks(db_path) == []
+    with sqlite3.connect(db_path) as conn:
+        assert json.loads(conn.execute("SELECT state FROM runs").fetchone()[0]) == {}
+    store.close()
@@ -0,0 +1,16 @@
+from common import content_store
+from common.content_store import count_documents, documents_size, is_batch, iter_documents, spill_documents
+
+
+def test_batches_spill_once_the_inline_documents_pass_the_threshold(tmp_path, monkeypatch):
+    batch = [{"title": "x" * 40}]
+    monkeypatch.setattr(content_store, "SPILL_THRESHOLD", documents_size(batch) * 3)
+
+    state = []
+    for _ in range(10):
+        inline_size = documents_size(doc for doc in state if not is_batch(doc))
+        state += spill_documents(list(batch), inline_size, batch_dir=str(tmp_path))
+
+    assert sum(1 for entry in state if not is_batch(entry)) == 3
+    assert count_documents(state) == 10
+    assert list(iter_documents(state)) == batch * 10
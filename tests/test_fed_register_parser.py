@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from agents.parse import fed_register_parser
+from agents.parse.fed_register_parser import FedRegisterParser
+
+FEED = {
+    "description": {"nested": {"results": [{"title": "not a result"}]}},
+    "count": 3,
+    "results": [
+        {
+            "title": "Capital rule",
+            "abstract": "Raises the é buffer",
+            "publication_date": "2025-03-05",
+            "pdf_url": "https://example.com/capital.pdf",
+            "document_number": "2025-0001",
+            "type": "Rule",
+            "agencies": [
+                {"name": "Federal Reserve", "slug": "federal-reserve", "parent": {"slug": "treasury"}},
+                {"name": "No slug", "raw_name": "NO SLUG"},
+                {"name": "OCC", "slug": "occ"},
+            ],
+            "page_views": {"count": 12, "last_updated": {"date": "2025-03-06", "history": [1, [2, 3]]}},
+            "regulation_id_numbers": [{"rin": "1234"}],
+        },
+        {"title": "No agencies", "filed_at": "2025-03-04T08:45:00-05:00", "agencies": [], "effective_on": None},
+        {"citation": "90 FR 1", "excerpts": [{"title": "ignored"}], "publication_date": "2025-03-03"},
+    ],
+}
+CONFIG = {"defaults": {"category": "Federal Register"}}
+
+
+def _documents(monkeypatch, streaming, orjson=None):
+    monkeypatch.setattr(fed_register_parser, "STREAMING", streaming)
+    monkeypatch.setattr(fed_register_parser, "orjson", orjson)
+    parser = FedRegisterParser()
+    return [doc.to_dict() for doc in parser.iter_documents(json.dumps(FEED).encode("utf-8"), CONFIG)]
+
+
+@pytest.mark.parametrize("fallback", ["json", "orjson"])
+def test_streaming_and_fallback_decoding_build_the_same_documents(monkeypatch, fallback):
+    monkeypatch.setattr(fed_register_parser, "ijson", pytest.importorskip("ijson"))
+    orjson = pytest.importorskip("orjson") if fallback == "orjson" else None
+
+    streamed = _documents(monkeypatch, streaming=True)
+    assert streamed == _documents(monkeypatch, streaming=False, orjson=orjson)
+    assert [doc["title"] for doc in streamed] == ["Capital rule", "No agencies", "No title"]
+    assert streamed[0]["issuingAuthority"] == "Federal Reserve"
+    assert streamed[0]["source"] == "federal-reserve, occ"
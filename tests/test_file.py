@@ -0,0 +1,12 @@
+from common.file import listArchivedFiles, writeFile
+
+
+def test_archived_raw_bodies_keep_their_header_charset(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    writeFile("FEED", b"<rss/>", "xml", charset="windows-1252")
+    writeFile("PAGE", "<html></html>", "htm")
+
+    archived = {f.source: f for f in listArchivedFiles()}
+    assert sorted(archived) == ["FEED", "PAGE"]
+    assert archived["FEED"].charset == "windows-1252"
+    assert archived["PAGE"].charset is None
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("bs4")
+
+from agents.parse.html_parser import HTMLParser  # noqa: E402
+
+BASE_URL = "https://example.com/news"
+CONFIG = {
+    "parser_config": {
+        "rowSelector": "table tr",
+        "columns": [
+            {"name": "title", "selector": "td:nth-of-type(1)"},
+            {"name": "publishedOn", "selector": "td:nth-of-type(2)"},
+            {"name": "linkToRegChangeText", "selector": "td:nth-of-type(1)"},
+        ],
+    }
+}
+PAGE = """
+<table>
+  <tr><th>Title</th><th>Date</th></tr>
+  <tr><td><a href="/1">Capital rule</a></td><td>2025-03-05</td></tr>
+  <tr><td><a href="/2">Liquidity rule</a></td><td>2025-03-04</td></tr>
+</table>
+"""
+
+
+def test_header_rows_do_not_count_as_new_items():
+    parser = HTMLParser()
+    soup = parser.make_soup(PAGE)
+    seen = {"https://example.com/1", "https://example.com/2"}
+
+    assert not parser.has_new_items(soup, CONFIG, BASE_URL, seen)
+    assert parser.has_new_items(soup, CONFIG, BASE_URL, seen - {"https://example.com/2"})
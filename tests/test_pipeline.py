@@ -0,0 +1,71 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("aiohttp")
+
+from common.checkpoint import configure_checkpoints  # noqa: E402
+from common.watermark import WatermarkStore  # noqa: E402
+from pipelines.pipeline import build_producer_pipeline  # noqa: E402
+from run_scanner import run_once  # noqa: E402
+
+FEED = {
+    "count": 2,
+    "results": [
+        {"title": "Capital rule", "publication_date": "2025-03-04", "pdf_url": ""},
+        {"title": "Liquidity rule", "publication_date": "2025-03-05", "pdf_url": ""},
+    ],
+}
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(FEED).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/feed.json"
+    server.shutdown()
+
+
+def test_single_run_goes_through_every_node(tmp_path, monkeypatch, feed_url):
+    # Stores live under ./downloads, so run in a scratch directory
+    monkeypatch.chdir(tmp_path)
+    scan_config = [
+        {
+            "source": "SMOKE-FEED",
+            "url": feed_url,
+            "parser_config": {"parser": "FED-REGISTER-PARSER"},
+            "fetch": {"backend": "http"},
+        }
+    ]
+    checkpoints = configure_checkpoints("smoke")
+    try:
+        pipeline = build_producer_pipeline()
+        asyncio.run(run_once(pipeline, scan_config, checkpoints))
+    finally:
+        checkpoints.close()
+        configure_checkpoints(None)
+
+    store = WatermarkStore()
+    try:
+        assert store.get("SMOKE-FEED") == datetime(2025, 3, 5, tzinfo=timezone.utc)
+    finally:
+        store.close()
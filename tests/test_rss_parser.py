@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("lxml")
+
+from agents.parse.rss_parser import RSSParserCustom  # noqa: E402
+
+FEED = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel>
+<item><title>Réforme des fonds propres</title><link>https://example.com/1</link>
+<pubDate>Wed, 05 Mar 2025 14:00:00 GMT</pubDate></item>
+</channel></rss>
+""".encode("utf-8")
+
+
+def test_feed_is_parsed_even_when_the_header_charset_is_wrong():
+    parser = RSSParserCustom()
+    parser.encoding = "utf-16"
+    documents = asyncio.run(parser.parse(FEED, {}, "https://example.com/feed"))
+
+    assert [doc.title for doc in documents] == ["Réforme des fonds propres"]
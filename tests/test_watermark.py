@@ -0,0 +1,24 @@
+from common.watermark import WatermarkStore, commit_watermarks
+
+
+def test_sources_with_fetch_errors_keep_their_watermark(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = {
+        "documents": [
+            {"title": "a", "scanSource": "A", "contentStatus": "fetched"},
+            {"title": "b1", "scanSource": "B", "contentStatus": "cached"},
+            {"title": "b2", "scanSource": "B", "contentStatus": "error: ClientResponseError"},
+        ],
+        "watermarks": {"A": "2025-03-05T00:00:00Z", "B": "2025-03-05T00:00:00Z"},
+        "seen_links": {"A": ["https://a/1"], "B": ["https://b/1"]},
+    }
+    commit_watermarks(state)
+
+    store = WatermarkStore()
+    try:
+        assert store.get("A") is not None
+        assert store.get("B") is None
+        assert store.seen_links("A") == {"https://a/1"}
+        assert store.seen_links("B") == set()
+    finally:
+        store.close()
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import pytest
+
+from common import work_queue
+from common.work_queue import SQLiteWorkQueue, open_work_queue, shard_for
+
+LEASE = 60.0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Only the queue's view of time moves
+    monkeypatch.setattr(work_queue, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_skips_sources_with_open_work(queue):
+    assert queue.enqueue("A", {"source": "A"})
+    assert not queue.enqueue("A", {"source": "A"})
+
+    item = queue.lease("c1", LEASE)
+    assert not queue.enqueue("A", {"source": "A"})
+    queue.ack(item.id, "c1")
+    assert queue.enqueue("A", {"source": "A"})
+
+
+def test_leased_item_is_hidden_until_the_lease_expires(queue, clock):
+    queue.enqueue("A", {"source": "A"})
+    first = queue.lease("c1", LEASE)
+    assert first.attempts == 1
+    assert queue.lease("c2", LEASE) is None
+
+    clock.now += LEASE + 1
+    second = queue.lease("c2", LEASE)
+    assert (second.id, second.attempts) == (first.id, 2)
+
+
+def test_consumer_that_lost_its_lease_cannot_extend_or_ack(queue, clock):
+    queue.enqueue("A", {"source": "A"})
+    item = queue.lease("c1", LEASE)
+    assert queue.extend(item.id, "c1", LEASE)
+
+    clock.now += LEASE + 1
+    queue.lease("c2", LEASE)
+    assert not queue.extend(item.id, "c1", LEASE)
+    queue.ack(item.id, "c1")
+    queue.nack(item.id, "c1", "late")
+    assert queue.stats() == {"leased": 1}
+
+    queue.ack(item.id, "c2")
+    assert queue.stats() == {"done": 1}
+
+
+def test_nack_retries_then_parks_the_item_as_failed(queue):
+    queue.enqueue("A", {"source": "A"})
+    item = queue.lease("c1", LEASE)
+    queue.nack(item.id, "c1", "boom")
+    assert queue.stats() == {"pending": 1}
+
+    item = queue.lease("c1", LEASE)
+    queue.nack(item.id, "c1", "boom")
+    assert queue.stats() == {"failed": 1}
+    assert queue.lease("c1", LEASE) is None
+
+
+def test_expired_lease_out_of_attempts_is_parked(queue, clock):
+    queue.enqueue("A", {"source": "A"})
+    queue.lease("c1", LEASE)
+    clock.now += LEASE + 1
+    queue.lease("c1", LEASE)
+    clock.now += LEASE + 1
+
+    assert queue.lease("c2", LEASE) is None
+    assert queue.stats() == {"failed": 1}
+
+
+def test_lease_only_takes_the_requested_shards(queue):
+    sources = [f"SOURCE-{i}" for i in range(8)]
+    for source in sources:
+        queue.enqueue(source, {"source": source}, num_shards=2)
+
+    leased = []
+    while (item := queue.lease("c1", LEASE, shards=[1])) is not None:
+        leased.append(item)
+
+    assert sorted(item.source for item in leased) == sorted(s for s in sources if shard_for(s, 2) == 1)
+    assert all(item.shard == 1 for item in leased)
+    assert queue.stats()["pending"] == sum(1 for s in sources if shard_for(s, 2) == 0)
+
+
+def test_open_work_queue_reads_sqlite_urls(tmp_path):
+    queue = open_work_queue(f"sqlite:///{tmp_path}/q.db")
+    try:
+        assert isinstance(queue, SQLiteWorkQueue)
+    finally:
+        queue.close()
+    with pytest.raises(ValueError):
+        open_work_queue("redis://localhost/0")